@@ -1,12 +1,27 @@
 """Fetch stock data and compute MA/EMA indicators for different timeframes."""
 
+import inspect
+import io
 import logging
+import logging.handlers
+import re
+import sys
+import traceback
 from datetime import datetime, timedelta
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-
-from poornull.data import Period, PriceHistory, download_daily, download_monthly, download_weekly
+from akshare_one import get_hist_data
+
+from poornull.data import (
+    Period,
+    PriceHistory,
+    download_daily,
+    download_monthly,
+    download_weekly,
+    load_or_fetch,
+    resample_ohlcv,
+)
 from poornull.indicators import (
     TomDemarkSequentialPhase,
     calculate_ma_ema,
@@ -17,10 +32,89 @@ from poornull.indicators import (
     find_macd_crossovers,
     tonghuashun_macd,
 )
+from poornull.indicators._common import _DATE_KEYWORDS, _find_col
 from poornull.rules import evaluate_daily_ma250_no_action
 
 logger = logging.getLogger(__name__)
 
+# Older akshare-one releases have no adjust parameter on get_hist_data
+_SUPPORTS_ADJUST = "adjust" in inspect.signature(get_hist_data).parameters
+
+# Downloads whose range ends today are re-fetched after this long, since the last bar
+# still changes during the trading day. Ranges ending in the past are cached forever.
+_TODAY_CACHE_MAX_AGE = timedelta(hours=1)
+
+# Length of one bar per timeframe (calendar months, so N months back lands on the same
+# day of the month) and the matching download function; other periods fall back to daily
+_PERIOD_LENGTHS = {
+    Period.DAILY: timedelta(days=1),
+    Period.WEEKLY: timedelta(weeks=1),
+    Period.MONTHLY: pd.DateOffset(months=1),
+}
+_DOWNLOADERS = {
+    Period.DAILY: download_daily,
+    Period.WEEKLY: download_weekly,
+    Period.MONTHLY: download_monthly,
+}
+
+# Timeframes reported by main(): period, Chinese name and MA periods (None for defaults)
+_TIMEFRAMES = (
+    (Period.DAILY, "日线", [5, 10, 20, 30, 60, 250]),
+    (Period.WEEKLY, "周线", None),
+    (Period.MONTHLY, "月线", None),
+)
+
+# OHLC columns downcast to float32 by process_stock_ma_ema
+_PRICE_COLUMNS = ("open", "high", "low", "close")
+
+# Prefix for rule signals by severity
+_SEVERITY_EMOJI = {"info": "ℹ️", "warning": "⚠️", "action": "🎯"}
+
+# Common technical indicator keywords, longest first so "MACD" is reported before "MA"
+_TECH_INDICATOR_PATTERN = re.compile(r"MACD|BOLL|RSI|KDJ|EMA|VOL|MA", re.IGNORECASE)
+
+
+def _log_frame(df: pd.DataFrame, index: bool = False, **to_string_kwargs) -> None:
+    """Log a table on its own lines, formatting it straight into one buffer."""
+    buf = io.StringIO()
+    buf.write("\n")
+    df.to_string(buf, index=index, **to_string_kwargs)
+    logger.info(buf.getvalue())
+
+
+def _ma_ema_display_cols(columns: pd.Index) -> list[str]:
+    """Date, close and the first 3 MA and first 3 EMA columns, in frame order."""
+    ma_cols = columns[columns.str.startswith("MA")].tolist()
+    ema_cols = columns[columns.str.startswith("EMA")].tolist()
+    return ["date", "close", *ma_cols[:3], *ema_cols[:3]]
+
+
+def _log_td_signals(rows: pd.DataFrame) -> None:
+    """Log one line per TD Sequential signal row, green for buy phases and red for sell."""
+    names = rows["TD_Phase_Name"]
+    symbols = np.where(names.str.startswith("Buy").to_numpy(), "🟢", "🔴")
+    for symbol, phase_name, date, close in zip(symbols, names, rows["date"], rows["close"], strict=True):
+        logger.info(f"{symbol} {phase_name} on {date} at price {close:.2f}")
+
+
+def _flush_logs() -> None:
+    """Write out buffered log records, so they are on screen before a chart window opens."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def _to_dash(date: str) -> str:
+    """Convert a "YYYYMMDD" date to the "YYYY-MM-DD" format akshare-one expects."""
+    if len(date) != 8 or not date.isdigit():
+        raise ValueError(f"Expected a date in YYYYMMDD format, got {date!r}")
+    return f"{date[:4]}-{date[4:6]}-{date[6:]}"
+
+
+def _cached_fetch(key: tuple, end_date: str, fetcher):
+    """Serve a download from the on-disk cache (end_date in format "YYYYMMDD")."""
+    max_age = None if end_date < datetime.now().strftime("%Y%m%d") else _TODAY_CACHE_MAX_AGE
+    return load_or_fetch(key, fetcher, max_age=max_age)
+
 
 def inspect_akshare_one_columns(stock_code, start_date, end_date):
     """
@@ -35,14 +129,16 @@ def inspect_akshare_one_columns(stock_code, start_date, end_date):
     Returns:
         DataFrame with sample data and column information
     """
-    from akshare_one import get_hist_data
-
     # Convert date format
-    start_date_formatted = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:8]}"
-    end_date_formatted = f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:8]}"
+    start_date_formatted = _to_dash(start_date)
+    end_date_formatted = _to_dash(end_date)
 
-    stock_data = get_hist_data(
-        symbol=stock_code, interval="day", start_date=start_date_formatted, end_date=end_date_formatted
+    stock_data = _cached_fetch(
+        ("akshare_one", stock_code, start_date, end_date, None),
+        end_date,
+        lambda: get_hist_data(
+            symbol=stock_code, interval="day", start_date=start_date_formatted, end_date=end_date_formatted
+        ),
     )
 
     if stock_data.empty:
@@ -53,17 +149,10 @@ def inspect_akshare_one_columns(stock_code, start_date, end_date):
     logger.info(f"   Total columns: {len(stock_data.columns)}")
     logger.info(f"   Column names: {list(stock_data.columns)}")
     logger.info("Sample data (first 3 rows):")
-    logger.info(f"\n{stock_data.head(3).to_string()}")
+    _log_frame(stock_data.head(3), index=True)
 
     # Check for common technical indicator keywords
-    tech_indicators = ["MACD", "RSI", "KDJ", "BOLL", "MA", "EMA", "VOL"]
-    found_indicators = []
-    for col in stock_data.columns:
-        col_str = str(col).upper()
-        for indicator in tech_indicators:
-            if indicator in col_str:
-                found_indicators.append(col)
-                break
+    found_indicators = [col for col in stock_data.columns if _TECH_INDICATOR_PATTERN.search(str(col))]
 
     if found_indicators:
         logger.info(f"Found potential technical indicator columns: {found_indicators}")
@@ -88,27 +177,26 @@ def get_stock_macd_crossovers(stock_code: str, start_date: str, end_date: str):
     Returns:
         Tuple of (stock_data_with_macd, crossovers_df)
     """
-    from akshare_one import get_hist_data
-
     # Fetch stock data using akshare-one
-    start_date_formatted = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:8]}"
-    end_date_formatted = f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:8]}"
+    start_date_formatted = _to_dash(start_date)
+    end_date_formatted = _to_dash(end_date)
 
     logger.info(f"Fetching stock {stock_code} data from {start_date_formatted} to {end_date_formatted}...")
     logger.info("   Using unadjusted prices (as Tonghuashun does for MACD)")
 
-    try:
-        stock_data = get_hist_data(
+    # Request unadjusted prices where the installed akshare-one supports it
+    adjust_kwargs = {"adjust": ""} if _SUPPORTS_ADJUST else {}
+    stock_data = _cached_fetch(
+        ("akshare_one", stock_code, start_date, end_date, ""),
+        end_date,
+        lambda: get_hist_data(
             symbol=stock_code,
             interval="day",
             start_date=start_date_formatted,
             end_date=end_date_formatted,
-            adjust="",  # Try unadjusted
-        )
-    except (TypeError, KeyError):
-        stock_data = get_hist_data(
-            symbol=stock_code, interval="day", start_date=start_date_formatted, end_date=end_date_formatted
-        )
+            **adjust_kwargs,
+        ),
+    )
 
     if stock_data.empty:
         raise ValueError(f"No data found for stock {stock_code}")
@@ -116,7 +204,8 @@ def get_stock_macd_crossovers(stock_code: str, start_date: str, end_date: str):
     # Rename timestamp to date if needed
     if "timestamp" in stock_data.columns:
         stock_data = stock_data.rename(columns={"timestamp": "date"})
-        stock_data["date"] = pd.to_datetime(stock_data["date"])
+        if not pd.api.types.is_datetime64_any_dtype(stock_data["date"]):
+            stock_data["date"] = pd.to_datetime(stock_data["date"], format="ISO8601", cache=True)
 
     # Calculate MACD using Tonghuashun method
     logger.info("Calculating MACD using Tonghuashun method (12, 26, 9, 2x multiplier)...")
@@ -130,12 +219,60 @@ def get_stock_macd_crossovers(stock_code: str, start_date: str, end_date: str):
     return stock_data_with_macd, crossovers
 
 
+def _date_range(period: Period, days_back: int, end_date: datetime | None) -> tuple[str, str]:
+    """Start and end date ("YYYYMMDD") covering the last days_back bars of period."""
+    if end_date is None:
+        end_date = datetime.now()
+    start_date = end_date - _PERIOD_LENGTHS.get(period, _PERIOD_LENGTHS[Period.DAILY]) * days_back
+    return start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")
+
+
+def fetch_stock_bars(
+    stock_code: str,
+    period: Period = Period.DAILY,
+    days_back: int = 1000,
+    end_date: datetime | None = None,
+) -> pd.DataFrame:
+    """
+    Fetch bars for the specified timeframe, without computing any indicators.
+
+    Blocking network I/O only, so several calls can run concurrently on a thread pool.
+
+    Args:
+        stock_code: Stock code (e.g., "600036")
+        period: Timeframe period (DAILY, WEEKLY, or MONTHLY)
+        days_back: Number of days/weeks/months to fetch (default: 1000)
+        end_date: End of the date range (default: now)
+
+    Returns:
+        DataFrame with OHLCV bars (see download_stock_data for details)
+    """
+    start_date_str, end_date_str = _date_range(period, days_back, end_date)
+    period_name = period.value.capitalize()
+
+    logger.info(f"Fetching {period_name} data for {stock_code}")
+    logger.info(f"   Date range: {start_date_str} to {end_date_str} (last {days_back} {period_name.lower()}s)")
+
+    # Download data based on period
+    downloader = _DOWNLOADERS.get(period, download_daily)
+    df = _cached_fetch(
+        (downloader.__name__, stock_code, start_date_str, end_date_str, ""),
+        end_date_str,
+        lambda: downloader(stock_code, start_date_str, end_date_str),
+    )
+
+    logger.info(f"Fetched {len(df)} records")
+    return df
+
+
 def process_stock_ma_ema(
     stock_code: str,
     period: Period = Period.DAILY,
     days_back: int = 1000,
     ma_periods: list[int] | None = None,
     ema_periods: list[int] | None = None,
+    df: pd.DataFrame | None = None,
+    end_date: datetime | None = None,
 ) -> pd.DataFrame:
     """
     Fetch stock data and compute MA/EMA for specified timeframe.
@@ -146,41 +283,26 @@ def process_stock_ma_ema(
         days_back: Number of days/weeks/months to fetch (default: 1000)
         ma_periods: List of MA periods to compute (default: [5, 10, 20, 30, 60])
         ema_periods: List of EMA periods to compute (default: [5, 10, 20, 30, 60])
+        df: Preloaded bars for this period (e.g. from fetch_stock_bars or resample_ohlcv).
+            When given, the download is skipped and the bars are limited to the same date range.
+        end_date: End of the date range (default: now). Pass one shared value when
+            processing several timeframes so they all end on the same day.
 
     Returns:
         DataFrame with MA and EMA columns
     """
-    # Calculate date range
-    end_date = datetime.now()
-    if period == Period.DAILY:
-        start_date = end_date - timedelta(days=days_back)
-    elif period == Period.WEEKLY:
-        start_date = end_date - timedelta(weeks=days_back)
-    elif period == Period.MONTHLY:
-        # Approximate months as 30 days
-        start_date = end_date - timedelta(days=days_back * 30)
-    else:
-        start_date = end_date - timedelta(days=days_back)
-
-    start_date_str = start_date.strftime("%Y%m%d")
-    end_date_str = end_date.strftime("%Y%m%d")
-
-    period_name = period.value.capitalize()
-
-    logger.info(f"Fetching {period_name} data for {stock_code}")
-    logger.info(f"   Date range: {start_date_str} to {end_date_str} (last {days_back} {period_name.lower()}s)")
-
-    # Download data based on period
-    if period == Period.DAILY:
-        df = download_daily(stock_code, start_date_str, end_date_str)
-    elif period == Period.WEEKLY:
-        df = download_weekly(stock_code, start_date_str, end_date_str)
-    elif period == Period.MONTHLY:
-        df = download_monthly(stock_code, start_date_str, end_date_str)
+    if df is None:
+        df = fetch_stock_bars(stock_code, period, days_back=days_back, end_date=end_date)
     else:
-        df = download_daily(stock_code, start_date_str, end_date_str)
+        start_date_str, end_date_str = _date_range(period, days_back, end_date)
+        period_name = period.value.capitalize()
+        logger.info(f"Using preloaded {period_name} data for {stock_code}")
+        logger.info(f"   Date range: {start_date_str} to {end_date_str} (last {days_back} {period_name.lower()}s)")
+        df = df[df["date"].between(pd.Timestamp(start_date_str), pd.Timestamp(end_date_str))]
+        logger.info(f"Selected {len(df)} records")
 
-    logger.info(f"Fetched {len(df)} records")
+    # float32 keeps ~7 significant digits, plenty for prices, at half the memory
+    df = df.astype({col: np.float32 for col in _PRICE_COLUMNS if col in df.columns})
 
     # Calculate MA and EMA
     logger.info("Calculating MA and EMA...")
@@ -200,54 +322,44 @@ def main():
     logger.info("Fetching last 1000 days/weeks/months till today")
 
     try:
-        # Process daily data
-        logger.info("\n" + "=" * 80)
-        logger.info("DAILY DATA (日线)")
-        logger.info("=" * 80)
-        daily_df = process_stock_ma_ema(
-            stock_code,
-            Period.DAILY,
-            days_back=1000,
-            ma_periods=[5, 10, 20, 30, 60, 250],
-        )
+        # Download daily bars once, covering the longest (monthly) range; weekly and
+        # monthly bars, and the chart data, are derived from them locally instead of
+        # being fetched again.
+        now = datetime.now()
+        history_days = (now - (now - _PERIOD_LENGTHS[Period.MONTHLY] * 1000)).days
+        history_df = fetch_stock_bars(stock_code, Period.DAILY, days_back=history_days, end_date=now)
+
+        # Process each timeframe from the single daily download
+        frames = {}
+        for period, chinese_name, ma_periods in _TIMEFRAMES:
+            logger.info("\n" + "=" * 80)
+            logger.info(f"{period.value.upper()} DATA ({chinese_name})")
+            logger.info("=" * 80)
+            frames[period] = df = process_stock_ma_ema(
+                stock_code,
+                period,
+                days_back=1000,
+                ma_periods=ma_periods,
+                df=resample_ohlcv(history_df, period),
+                end_date=now,
+            )
 
-        # Show latest values
-        ma_cols = [col for col in daily_df.columns if col.startswith("MA")]
-        ema_cols = [col for col in daily_df.columns if col.startswith("EMA")]
-        display_cols = ["date", "close"] + ma_cols[:3] + ema_cols[:3]  # Show first 3 of each
+            # Show latest values
+            logger.info(f"Latest {period.value.capitalize()} MA/EMA Values:")
+            _log_frame(df.tail(10)[_ma_ema_display_cols(df.columns)])
 
-        logger.info("Latest Daily MA/EMA Values:")
-        logger.info(f"\n{daily_df[display_cols].tail(10).to_string(index=False)}")
+        daily_df, weekly_df = frames[Period.DAILY], frames[Period.WEEKLY]
 
         # Evaluate trading rules using PriceHistory API
         daily_history = PriceHistory(daily_df)
         signal = evaluate_daily_ma250_no_action(daily_history)
         if signal:
-            emoji = {"info": "ℹ️", "warning": "⚠️", "action": "🎯"}[signal.severity]
-            logger.warning(f"{emoji} {signal.message}")
+            logger.warning(f"{_SEVERITY_EMOJI[signal.severity]} {signal.message}")
             if signal.metadata:
                 logger.info(f"   Close: {signal.metadata['close']:.2f}")
                 logger.info(f"   MA250: {signal.metadata['ma250']:.2f}")
                 logger.info(f"   Distance: {signal.metadata['distance_pct']:.2f}%")
 
-        # Process weekly data
-        logger.info("\n" + "=" * 80)
-        logger.info("WEEKLY DATA (周线)")
-        logger.info("=" * 80)
-        weekly_df = process_stock_ma_ema(stock_code, Period.WEEKLY, days_back=1000)
-
-        logger.info("Latest Weekly MA/EMA Values:")
-        logger.info(f"\n{weekly_df[display_cols].tail(10).to_string(index=False)}")
-
-        # Process monthly data
-        logger.info("\n" + "=" * 80)
-        logger.info("MONTHLY DATA (月线)")
-        logger.info("=" * 80)
-        monthly_df = process_stock_ma_ema(stock_code, Period.MONTHLY, days_back=1000)
-
-        logger.info("Latest Monthly MA/EMA Values:")
-        logger.info(f"\n{monthly_df[display_cols].tail(10).to_string(index=False)}")
-
         # Process weekly MA crossovers
         logger.info("\n" + "=" * 80)
         logger.info("WEEKLY MA CROSSOVERS ANALYSIS")
@@ -262,28 +374,22 @@ def main():
         if crossovers.empty:
             logger.warning("No MA crossovers found")
         else:
-            logger.info(f"Found {len(crossovers)} MA crossover(s):\n")
-            for _, row in crossovers.iterrows():
-                cross_type = row["type"]
-                if "golden" in cross_type:
-                    cross_symbol = "🟢"
-                    cross_name = "Golden Cross"
-                    ma_type = "MA20" if "ma20" in cross_type else "MA30"
-                    cross_name = f"{cross_name} ({ma_type} crosses above MA60)"
-                else:
-                    cross_symbol = "🔴"
-                    cross_name = "Death Cross"
-                    ma_type = "MA20" if "ma20" in cross_type else "MA30"
-                    cross_name = f"{cross_name} ({ma_type} crosses below MA60)"
-
-                logger.info(f"{cross_symbol} {cross_name}")
-                logger.info(f"   Date: {row['date']}")
-                logger.info(f"   MA20: {row['ma20']:.2f}")
-                logger.info(f"   MA30: {row['ma30']:.2f}")
-                logger.info(f"   MA60: {row['ma60']:.2f}")
-                if pd.notna(row.get("close_price")):
-                    logger.info(f"   Close Price: {row['close_price']:.2f}")
-                logger.info("")
+            logger.info(f"Found {len(crossovers)} MA crossover(s):")
+            is_golden = crossovers["is_golden"].to_numpy()
+            ma_type = crossovers["ma_short"].to_numpy(dtype=str)
+            summary = pd.DataFrame(
+                {
+                    "signal": np.where(is_golden, "🟢 Golden Cross", "🔴 Death Cross"),
+                    "cross": np.char.add(ma_type, np.where(is_golden, " crosses above MA60", " crosses below MA60")),
+                    "date": crossovers["date"].to_numpy(),
+                    "ma20": crossovers["ma20"].to_numpy(),
+                    "ma30": crossovers["ma30"].to_numpy(),
+                    "ma60": crossovers["ma60"].to_numpy(),
+                }
+            )
+            if crossovers["close_price"].notna().any():
+                summary["close_price"] = crossovers["close_price"].to_numpy()
+            _log_frame(summary, float_format="{:.2f}".format)
 
         # Find periods where MA20 or MA30 beats MA60
         above_periods = find_ma_above_ma60(weekly_ma_df)
@@ -296,7 +402,7 @@ def main():
             display_cols = ["date", "ma20_above", "ma30_above", "ma20", "ma30", "ma60"]
             if "close_price" in above_periods.columns:
                 display_cols.append("close_price")
-            logger.info(f"\n{above_periods[display_cols].tail(10).to_string(index=False)}")
+            _log_frame(above_periods.tail(10)[display_cols])
 
         # Comprehensive visualization with all indicators on same graph
         logger.info("\n" + "=" * 80)
@@ -307,41 +413,39 @@ def main():
         logger.info("Calculating TomDeMark Sequential for daily data...")
         daily_td = calculate_tomdemark_sequential(daily_df)
 
-        # Show recent TD Sequential activity
-        recent_td = daily_td[(daily_td["TD_Setup_Count"] > 0) | (daily_td["TD_Countdown_Count"] > 0)].tail(15)
+        # Find the active, completed-setup and completed-countdown rows in one go on the
+        # raw arrays, then only materialize the few rows that are printed
+        setup_count = daily_td["TD_Setup_Count"].to_numpy()
+        countdown_count = daily_td["TD_Countdown_Count"].to_numpy()
+        phase = daily_td["TD_Phase"].to_numpy()
+        active_rows = np.flatnonzero((setup_count > 0) | (countdown_count > 0))
+        setup_rows = np.flatnonzero((setup_count == 9) & (phase != TomDemarkSequentialPhase.NONE))
+        countdown_rows = np.flatnonzero(countdown_count == 13)
 
-        if not recent_td.empty:
+        # Show recent TD Sequential activity
+        if active_rows.size:
             logger.info("Recent TD Sequential Activity (last 15 active bars):")
             display_cols = ["date", "close", "TD_Phase_Name", "TD_Setup_Count", "TD_Countdown_Count"]
-            logger.info(f"\n{recent_td[display_cols].to_string(index=False)}")
+            _log_frame(daily_td.iloc[active_rows[-15:]][display_cols])
         else:
             logger.warning("No active TD Sequential phases in recent data")
 
-        # Find completed setups
-        completed_setups = daily_td[
-            (daily_td["TD_Setup_Count"] == 9) & (daily_td["TD_Phase"] != TomDemarkSequentialPhase.NONE)
-        ]
-
-        if not completed_setups.empty:
-            logger.info(f"Found {len(completed_setups)} completed setup(s):")
-            for _, row in completed_setups.tail(5).iterrows():
-                phase_name = row["TD_Phase_Name"]
-                symbol = "🟢" if "Buy" in phase_name else "🔴"
-                logger.info(f"{symbol} {phase_name} on {row['date']} at price {row['close']:.2f}")
+        # Completed setups
+        if setup_rows.size:
+            logger.info(f"Found {setup_rows.size} completed setup(s):")
+            _log_td_signals(daily_td.iloc[setup_rows[-5:]])
 
-        # Find completed countdowns
-        completed_countdowns = daily_td[daily_td["TD_Countdown_Count"] == 13]
-
-        if not completed_countdowns.empty:
-            logger.info(f"Found {len(completed_countdowns)} completed countdown(s) (strong reversal signal):")
-            for _, row in completed_countdowns.tail(3).iterrows():
-                phase_name = row["TD_Phase_Name"]
-                symbol = "🟢" if "Buy" in phase_name else "🔴"
-                logger.info(f"{symbol} {phase_name} on {row['date']} at price {row['close']:.2f}")
+        # Completed countdowns
+        if countdown_rows.size:
+            logger.info(f"Found {countdown_rows.size} completed countdown(s) (strong reversal signal):")
+            _log_td_signals(daily_td.iloc[countdown_rows[-3:]])
 
         # Generate comprehensive visualization with all indicators
         logger.info("Generating comprehensive chart with all indicators...")
         try:
+            # Imported here so runs that never draw skip loading matplotlib
+            import matplotlib.pyplot as plt
+
             from poornull.visualize import (
                 create_figure,
                 format_date_axis,
@@ -355,16 +459,14 @@ def main():
                 setup_style,
             )
 
-            # Use last 365 days for better visualization
-            end_date_str = datetime.now().strftime("%Y%m%d")
-            start_date_str = (datetime.now() - timedelta(days=365)).strftime("%Y%m%d")
-
-            # Get data for visualization period
-            from poornull.data import download_daily
+            # Use last 365 days for better visualization. daily_td already covers them and
+            # carries the MA and TD Sequential columns, so slice it instead of recomputing.
+            start_date_str, end_date_str = _date_range(Period.DAILY, 365, now)
+            viz_df = daily_td[daily_td["date"] >= pd.Timestamp(start_date_str)].reset_index(drop=True)
 
-            viz_df = download_daily(stock_code, start_date_str, end_date_str)
-            viz_df = calculate_ma_ema(viz_df, ma_periods=[5, 10, 20, 30, 60])
-            viz_df = calculate_tomdemark_sequential(viz_df)
+            # The chart only needs display precision, so plot from float32 columns
+            # (prices are float32 already; this covers MA/EMA, volume and TDST levels)
+            viz_df = viz_df.astype(dict.fromkeys(viz_df.columns[viz_df.dtypes == np.float64], np.float32))
 
             # Setup style
             setup_style(figsize=(18, 12))
@@ -382,25 +484,28 @@ def main():
             if date_col is None:
                 raise ValueError("Could not find date column in DataFrame")
 
+            # Convert the dates once and share them with every plot
+            dates = pd.to_datetime(viz_df[date_col])
+
             # Main chart: Candlesticks + MA + Trendlines + TD Sequential
             plot_candlesticks(
                 ax_main,
                 viz_df,
-                date_col=date_col,
                 open_col="open",
                 high_col="high",
                 low_col="low",
                 close_col="close",
+                dates=dates,
             )
 
             # Plot moving averages
-            plot_moving_averages(ax_main, viz_df, date_col=date_col, ma_periods=[5, 10, 20, 30, 60])
+            plot_moving_averages(ax_main, viz_df, ma_periods=[5, 10, 20, 30, 60], dates=dates)
 
             # Plot trendlines
-            plot_trendlines(ax_main, viz_df, date_col=date_col, method="linear", label="Linear Trend")
+            plot_trendlines(ax_main, viz_df, method="linear", label="Linear Trend", dates=dates)
 
             # Plot TomDeMark Sequential phases
-            plot_tomdemark_sequential(ax_main, viz_df, date_col=date_col, show_annotations=True)
+            plot_tomdemark_sequential(ax_main, viz_df, show_annotations=True, dates=dates)
 
             # Set title and format main chart
             ax_main.set_title(
@@ -417,13 +522,14 @@ def main():
             format_date_axis(ax_main, date_col, viz_df)
 
             # Bottom chart: TD Sequential counters
-            plot_tomdemark_counters(ax_counters, viz_df, date_col=date_col)
+            plot_tomdemark_counters(ax_counters, viz_df, dates=dates)
             ax_counters.set_xlabel("Date", fontsize=12, fontweight="bold")
             format_date_axis(ax_counters, date_col, viz_df)
 
             plt.tight_layout()
 
             # Save and show
+            _flush_logs()
             save_or_show(fig, save_path="comprehensive_stock_chart.png", show=True)
 
             logger.info("Comprehensive chart saved to comprehensive_stock_chart.png")
@@ -436,8 +542,6 @@ def main():
 
         except Exception as e:
             logger.warning(f"Could not generate visualization: {e}")
-            import traceback
-
             traceback.print_exc()
             logger.info("   (This is okay - you can run demo_tomdemark_sequential() separately)")
 
@@ -469,35 +573,32 @@ def test_macd():
             logger.warning("No MACD crossovers found in this period")
         else:
             logger.info(f"Found {len(crossovers)} MACD crossover(s):\n")
-            for _, row in crossovers.iterrows():
-                cross_type = row["type"]
-                cross_symbol = "🟢" if cross_type == "golden" else "🔴"
-                cross_name = "Golden Cross (Bullish)" if cross_type == "golden" else "Death Cross (Bearish)"
+            has_macd = "macd" in crossovers.columns
+            has_close_price = "close_price" in crossovers.columns
+            for row in crossovers.itertuples(index=False):
+                is_golden = row.type == "golden"
+                cross_symbol = "🟢" if is_golden else "🔴"
+                cross_name = "Golden Cross (Bullish)" if is_golden else "Death Cross (Bearish)"
                 logger.info(f"{cross_symbol} {cross_name}")
-                logger.info(f"   Date: {row['date']}")
-                logger.info(f"   DIF: {row['dif']:.4f}")
-                logger.info(f"   DEA: {row['dea']:.4f}")
-                if "macd" in row:
-                    logger.info(f"   MACD (Histogram): {row['macd']:.4f}")
-                if "close_price" in row:
-                    logger.info(f"   Close Price: {row['close_price']:.2f}")
+                logger.info(f"   Date: {row.date}")
+                logger.info(f"   DIF: {row.dif:.4f}")
+                logger.info(f"   DEA: {row.dea:.4f}")
+                if has_macd:
+                    logger.info(f"   MACD (Histogram): {row.macd:.4f}")
+                if has_close_price:
+                    logger.info(f"   Close Price: {row.close_price:.2f}")
                 logger.info("")
 
         # Show latest MACD values
         logger.info("Latest MACD values:")
-        date_col = None
-        for col in stock_data.columns:
-            col_lower = str(col).lower()
-            if "timestamp" in col_lower or "date" in col_lower or "日期" in str(col):
-                date_col = col
-                break
+        date_col = _find_col(tuple(stock_data.columns), _DATE_KEYWORDS)
         if date_col:
             # Show DIF, DEA, MACD (Tonghuashun terminology)
             display_cols = [date_col, "DIF", "DEA", "MACD"]
             available_cols = [col for col in display_cols if col in stock_data.columns]
             if available_cols:
                 latest = stock_data.tail(5)[available_cols]
-                logger.info(f"\n{latest.to_string(index=False)}")
+                _log_frame(latest)
 
     except Exception as e:
         logger.error(f"Error occurred: {e}", exc_info=True)
@@ -513,7 +614,6 @@ def visualize_tomdemark_sequential(stock_code: str, start_date: str, end_date: s
         end_date: End date in format "YYYYMMDD"
         save_path: Optional path to save the figure (e.g., "td_sequential_chart.png")
     """
-    from poornull.data import download_daily
     from poornull.visualize import create_tomdemark_chart
 
     logger.info(f"Visualizing TomDeMark Sequential for {stock_code}")
@@ -533,30 +633,30 @@ def visualize_tomdemark_sequential(stock_code: str, start_date: str, end_date: s
     if save_path is None:
         save_path = "tomdemark_sequential_chart.png"
 
+    _flush_logs()
     create_tomdemark_chart(df, stock_code, start_date, end_date, save_path=save_path, show=True)
 
     # Print summary statistics
     logger.info("TD Sequential Summary:")
     logger.info(f"   Total bars analyzed: {len(df)}")
-    logger.info(f"   Buy Setups completed: {len(df[df['TD_Setup_Count'] == 9])}")
-    logger.info(f"   Sell Setups completed: {len(df[(df['TD_Setup_Count'] == 9) & (df['TD_Phase'].isin([2, 6]))])}")
-    logger.info(f"   Buy Countdowns completed: {len(df[(df['TD_Countdown_Count'] == 13) & (df['TD_Phase'] == 3)])}")
-    logger.info(f"   Sell Countdowns completed: {len(df[(df['TD_Countdown_Count'] == 13) & (df['TD_Phase'] == 4)])}")
+    setup_count = df["TD_Setup_Count"].to_numpy()
+    countdown_count = df["TD_Countdown_Count"].to_numpy()
+    phase = df["TD_Phase"].to_numpy()
+    setup_done = setup_count == 9
+    countdown_done = countdown_count == 13
+    logger.info(f"   Buy Setups completed: {np.count_nonzero(setup_done)}")
+    logger.info(f"   Sell Setups completed: {np.count_nonzero(setup_done & np.isin(phase, [2, 6]))}")
+    logger.info(f"   Buy Countdowns completed: {np.count_nonzero(countdown_done & (phase == 3))}")
+    logger.info(f"   Sell Countdowns completed: {np.count_nonzero(countdown_done & (phase == 4))}")
 
     # Show recent activity
-    date_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "date" in col_lower or "timestamp" in col_lower or "日期" in str(col):
-            date_col = col
-            break
-
+    date_col = _find_col(tuple(df.columns), _DATE_KEYWORDS)
     if date_col:
-        recent_activity = df[(df["TD_Setup_Count"] > 0) | (df["TD_Countdown_Count"] > 0)].tail(10)
+        recent_activity = df[(setup_count > 0) | (countdown_count > 0)].tail(10)
         if not recent_activity.empty:
             logger.info("Recent TD Sequential Activity:")
             display_cols = [date_col, "close", "TD_Phase_Name", "TD_Setup_Count", "TD_Countdown_Count"]
-            logger.info(f"\n{recent_activity[display_cols].to_string(index=False)}")
+            _log_frame(recent_activity[display_cols])
 
 
 def demo_tomdemark_sequential():
@@ -575,7 +675,26 @@ def demo_tomdemark_sequential():
         logger.error(f"Error occurred: {e}", exc_info=True)
 
 
+def configure_logging(capacity: int = 10000) -> None:
+    """
+    Send log records to stdout through a buffer that is written out in one go.
+
+    Records are held in a MemoryHandler and flushed when the buffer is full, when a
+    WARNING or ERROR is logged, before a chart is shown (_flush_logs), or at interpreter
+    exit (logging.shutdown), instead of issuing one write per line.
+
+    Args:
+        capacity: Number of records to buffer before flushing (default: 10000)
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    buffer_handler = logging.handlers.MemoryHandler(capacity, flushLevel=logging.WARNING, target=stream_handler)
+    logging.basicConfig(level=logging.INFO, handlers=[buffer_handler])
+
+
 if __name__ == "__main__":
+    configure_logging()
+
     # Uncomment the line below to run TD Sequential visualization
     # demo_tomdemark_sequential()
     main()
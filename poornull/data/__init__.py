@@ -1,13 +1,16 @@
 """Data download utilities for stock market data."""
 
+from .cache import load_or_fetch
 from .constants import Indicator, IndicatorType
 from .download import (
     Period,
     download_daily,
+    download_many,
     download_monthly,
     download_quarterly,
     download_stock_data,
     download_weekly,
+    resample_ohlcv,
 )
 from .models import Bar, PriceHistory, Signal
 
@@ -18,6 +21,9 @@ __all__ = [
     "download_weekly",
     "download_monthly",
     "download_quarterly",
+    "download_many",
+    "resample_ohlcv",
+    "load_or_fetch",
     "Bar",
     "PriceHistory",
     "Signal",
@@ -0,0 +1,112 @@
+"""
+On-disk cache for downloaded market data.
+
+Historical bars for past dates never change, so re-downloading them on every run only
+adds network latency. This module stores downloaded DataFrames on disk, keyed by the
+request parameters, and serves later identical requests from disk.
+
+Frames are stored as zstd-compressed Parquet when pyarrow is installed, and as pickles
+otherwise.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# Override the cache location with the POORNULL_CACHE_DIR environment variable
+DEFAULT_CACHE_DIR = Path(os.environ.get("POORNULL_CACHE_DIR", Path.home() / ".cache" / "poornull"))
+
+_CACHE_SUFFIX = ".parquet" if pyarrow is not None else ".pkl"
+
+
+def _cache_path(key: tuple, cache_dir: Path) -> Path:
+    """Map a cache key to a file path inside cache_dir."""
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+    return cache_dir / f"{digest}{_CACHE_SUFFIX}"
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    if pyarrow is not None:
+        return pd.read_parquet(path, engine="pyarrow")
+    return pd.read_pickle(path)
+
+
+def _write_frame(df: pd.DataFrame, path: Path) -> None:
+    # Write to a temporary file first so a crash never leaves a truncated cache entry.
+    # Each writer gets its own temp name, so concurrent writes of the same key can't
+    # move each other's half-written file into place.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        if pyarrow is not None:
+            # Keep the index, like the pickle fallback does
+            df.to_parquet(tmp_name, engine="pyarrow", compression="zstd")
+        else:
+            df.to_pickle(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def load_or_fetch(
+    key: tuple,
+    fetcher: Callable[[], pd.DataFrame],
+    max_age: timedelta | None = None,
+    cache_dir: Path | None = None,
+) -> pd.DataFrame:
+    """
+    Return a cached DataFrame for key, calling fetcher on a cache miss.
+
+    Args:
+        key: Tuple identifying the request, e.g. ("daily", "600036", "20240101", "20241231", "").
+            Every parameter that changes the result must be part of the key.
+        fetcher: Zero-argument callable that downloads the data
+        max_age: Maximum age of a cache entry before it is fetched again. None (default)
+            never expires, which is right for ranges that end in the past. Pass a limit for
+            ranges that end today, whose last bar still changes.
+        cache_dir: Cache directory (default: ~/.cache/poornull or $POORNULL_CACHE_DIR)
+
+    Returns:
+        DataFrame from the cache or from fetcher
+
+    Example:
+        >>> df = load_or_fetch(
+        ...     ("daily", "600036", "20240101", "20241231", ""),
+        ...     lambda: download_daily("600036", "20240101", "20241231"),
+        ... )
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    path = _cache_path(key, cache_dir)
+
+    if path.exists():
+        age = time.time() - path.stat().st_mtime
+        if max_age is None or age < max_age.total_seconds():
+            try:
+                return _read_frame(path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+
+    df = fetcher()
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_frame(df, path)
+    except Exception as e:
+        logger.warning(f"Could not write cache entry {path}: {e}")
+
+    return df
@@ -6,15 +6,23 @@ This module provides functions to download stock market data for:
 - Weekly data (周线)
 - Monthly data (月线)
 - Quarterly data (季线)
+
+It also provides a helper to derive weekly/monthly/quarterly bars from daily bars
+locally, so several timeframes can be built from a single download.
 """
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 import akshare as ak
+import numpy as np
 import pandas as pd
 
 from .constants import AKSHARE_COLUMN_MAPPING
 
+logger = logging.getLogger(__name__)
+
 
 class Period(str, Enum):
     """Timeframe period for stock data."""
@@ -25,12 +33,34 @@ class Period(str, Enum):
     QUARTERLY = "quarterly"
 
 
+# Bin boundaries used to derive coarser bars from daily bars. Weeks close on Friday,
+# months and quarters on their last calendar day.
+_RESAMPLE_OFFSETS = {
+    Period.WEEKLY: pd.offsets.Week(weekday=4),
+    Period.MONTHLY: pd.offsets.MonthEnd(),
+    Period.QUARTERLY: pd.offsets.QuarterEnd(startingMonth=12),
+}
+
+# How each OHLCV column is aggregated into a coarser bar. The bar is dated on its
+# last trading day, matching the bars akshare returns for weekly/monthly periods.
+_RESAMPLE_AGGREGATIONS = {
+    "date": "last",
+    "open": "first",
+    "close": "last",
+    "high": "max",
+    "low": "min",
+    "volume": "sum",
+    "amount": "sum",
+}
+
+
 def download_stock_data(
     stock_code: str,
     start_date: str,
     end_date: str,
     period: Period = Period.DAILY,
     adjust: str = "",
+    price_dtype: type[np.floating] = np.float64,
 ) -> pd.DataFrame:
     """
     Download stock market data for the specified timeframe.
@@ -48,6 +78,10 @@ def download_stock_data(
             - "" (empty string): Unadjusted (不复权) - default
             - "qfq": Forward adjusted (前复权)
             - "hfq": Backward adjusted (后复权)
+        price_dtype: Float dtype of the open/high/low/close columns (default np.float64).
+            np.float32 halves the bytes every indicator pass reads and keeps about seven
+            significant digits, plenty for A-share prices quoted to 0.01. Volume and
+            amount keep their dtype, since share counts can exceed float32 precision.
 
     Returns:
         DataFrame with columns:
@@ -85,15 +119,19 @@ def download_stock_data(
     if df.empty:
         raise ValueError(f"No data found for stock {stock_code}")
 
-    # Convert column names to English
-    df = df.rename(columns=AKSHARE_COLUMN_MAPPING)
+    # Convert column names to English (the frame is ours, so rename it in place)
+    df.rename(columns=AKSHARE_COLUMN_MAPPING, inplace=True)
 
     # Convert date to datetime
     if "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"])
+        df["date"] = pd.to_datetime(df["date"], format="ISO8601", cache=True)
 
-    # Sort by date
-    if "date" in df.columns:
+    if price_dtype is not np.float64:
+        price_cols = [col for col in ("open", "high", "low", "close") if col in df.columns]
+        df[price_cols] = df[price_cols].astype(price_dtype)
+
+    # Sort by date (akshare normally returns ascending dates already)
+    if "date" in df.columns and not df["date"].is_monotonic_increasing:
         df = df.sort_values(by="date")
 
     return df
@@ -205,3 +243,79 @@ def download_quarterly(
         >>> df = download_quarterly("600036", "20240101", "20241231")
     """
     return download_stock_data(stock_code, start_date, end_date, period=Period.QUARTERLY, adjust=adjust)
+
+
+def download_many(
+    stock_codes: list[str],
+    start_date: str,
+    end_date: str,
+    period: Period = Period.DAILY,
+    adjust: str = "",
+    max_workers: int = 8,
+) -> dict[str, pd.DataFrame | None]:
+    """
+    Download several stocks concurrently.
+
+    Downloads are network-bound, so they run on a thread pool instead of one after another.
+    A stock that fails to download is logged as a warning and maps to None, so one bad
+    code does not abort the whole batch (same policy as calculate_tonghuashun_macd_batch).
+
+    Args:
+        stock_codes: Stock codes (e.g., ["600036", "600519"])
+        start_date: Start date in YYYYMMDD format
+        end_date: End date in YYYYMMDD format
+        period: Timeframe period (default: Period.DAILY)
+        adjust: Price adjustment type ("", "qfq" or "hfq", default: "")
+        max_workers: Maximum number of concurrent downloads (default: 8)
+
+    Returns:
+        Dict mapping each stock code to its DataFrame (see download_stock_data for details),
+        in the order of stock_codes, or to None if the download failed.
+
+    Example:
+        >>> frames = download_many(["600036", "600519"], "20240101", "20241231")
+        >>> frames["600519"].tail()
+    """
+
+    def fetch(stock_code: str) -> pd.DataFrame | None:
+        try:
+            return download_stock_data(stock_code, start_date, end_date, period=period, adjust=adjust)
+        except Exception as e:
+            logger.warning(f"Failed to download {stock_code}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(stock_codes, executor.map(fetch, stock_codes), strict=True))
+
+
+def resample_ohlcv(df: pd.DataFrame, period: Period) -> pd.DataFrame:
+    """
+    Derive coarser bars from daily bars without another download.
+
+    Only columns that can be aggregated exactly (date, open, close, high, low, volume,
+    amount) are kept. Derived columns such as pct_change or turnover are dropped.
+
+    Args:
+        df: DataFrame with daily bars, as returned by download_daily
+        period: Target timeframe (Period.WEEKLY, Period.MONTHLY or Period.QUARTERLY).
+            Period.DAILY returns the input unchanged.
+
+    Returns:
+        DataFrame with one row per period, dated on the last trading day of the period.
+
+    Example:
+        >>> daily = download_daily("600036", "20200101", "20241231")
+        >>> weekly = resample_ohlcv(daily, Period.WEEKLY)
+        >>> monthly = resample_ohlcv(daily, Period.MONTHLY)
+    """
+    if period == Period.DAILY:
+        return df
+
+    if "date" not in df.columns:
+        raise ValueError(f"Date column 'date' not found in DataFrame. Available columns: {list(df.columns)}")
+
+    aggregations = {col: how for col, how in _RESAMPLE_AGGREGATIONS.items() if col in df.columns}
+    resampled = df.resample(_RESAMPLE_OFFSETS[period], on="date").agg(aggregations)
+
+    # Periods without any trading day (e.g. holiday weeks) come out as empty rows
+    return resampled.dropna(subset=["date"]).reset_index(drop=True)
@@ -13,10 +13,43 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, types
+except ImportError:  # numba is optional, fall back to NumPy comparisons
+    njit = None
 
-@dataclass(frozen=True)
+if njit is not None:
+    # _col() hands out read-only arrays; writable ones match the signature too
+    _VALUES = types.Array(types.float64, 1, "C", readonly=True)
+
+    @njit(types.boolean(_VALUES, _VALUES, types.int64), cache=True, nogil=True)
+    def _all_greater_kernel(a, b, start):
+        """True if a[i] > b[i] for every i from start on, stopping at the first miss (NaN never passes)."""
+        for i in range(start, a.shape[0]):
+            if not a[i] > b[i]:
+                return False
+        return True
+
+else:
+    _all_greater_kernel = None
+
+
+def _date_key(date: str | datetime | pd.Timestamp) -> np.datetime64:
+    """Normalize a date to midnight as a datetime64[ns] key comparable with PriceHistory dates."""
+    return pd.Timestamp(date).normalize().as_unit("ns").to_datetime64()
+
+
+def _all_greater(a: np.ndarray, b: np.ndarray, start: int) -> bool:
+    """Whether a[start:] > b[start:] holds element-wise."""
+    if _all_greater_kernel is not None:
+        return bool(_all_greater_kernel(a, b, start))
+    return bool(np.all(a[start:] > b[start:]))
+
+
+@dataclass(frozen=True, slots=True)
 class Bar:
     """Single OHLCV bar - immutable."""
 
@@ -31,7 +64,7 @@ class Bar:
     def from_series(cls, row: pd.Series) -> Bar:
         """Create Bar from DataFrame row."""
         return cls(
-            date=pd.to_datetime(row["date"]),
+            date=pd.Timestamp(row["date"]),
             open=float(row["open"]),
             high=float(row["high"]),
             low=float(row["low"]),
@@ -72,24 +105,74 @@ class PriceHistory:
             raise ValueError("Cannot create PriceHistory from empty DataFrame")
 
         self._validate_schema(df)
-        self._df = df.copy().sort_values("date").reset_index(drop=True)
-
-        self._date_index = pd.Series(self._df.index, index=pd.DatetimeIndex(self._df["date"]))
+        # Parse dates once here, so everything below can rely on a datetime64 column
+        if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+            df = df.assign(date=pd.to_datetime(df["date"]))
+        # Downloads already come sorted, so the O(n log n) sort is usually skipped.
+        # Either way reset_index returns a new frame, so the caller's df is never aliased.
+        if not df["date"].is_monotonic_increasing:
+            df = df.sort_values("date")
+        self._df = df.reset_index(drop=True)
         self._cache = {}
 
+        # Bar fields as plain arrays (one per column), so building a Bar is a few array
+        # reads instead of materializing a row Series. The sorted date keys also serve
+        # date lookups through binary search.
+        self._date_keys = self._df["date"].to_numpy(dtype="datetime64[ns]").view()
+        self._date_keys.flags.writeable = False
+        self._open = self._col("open")
+        self._high = self._col("high")
+        self._low = self._col("low")
+        self._close = self._col("close")
+        self._volume = self._col("volume")
+
     @classmethod
     def _validate_schema(cls, df: pd.DataFrame) -> None:
         """Validate DataFrame has required columns."""
-        missing = cls.REQUIRED_COLUMNS - set(df.columns)
+        # Look each required column up in the column index instead of hashing every label into a set
+        missing = sorted(col for col in cls.REQUIRED_COLUMNS if col not in df.columns)
         if missing:
             raise ValueError(f"Missing required columns: {missing}. Required: {cls.REQUIRED_COLUMNS}")
 
+    def _bar(self, i: int) -> Bar:
+        """Build the Bar at position i from the column arrays."""
+        return Bar(
+            date=pd.Timestamp(self._date_keys[i]),
+            open=float(self._open[i]),
+            high=float(self._high[i]),
+            low=float(self._low[i]),
+            close=float(self._close[i]),
+            volume=float(self._volume[i]),
+        )
+
+    def _date_position(self, date: str | datetime | pd.Timestamp) -> int | None:
+        """Position of the bar dated exactly on date, or None if there is none."""
+        # Exact lookups go through a dict keyed by nanoseconds since the epoch, built on
+        # first use; range queries (asof, between) keep using binary search
+        positions = self._cache.get("_date_positions")
+        if positions is None:
+            nanos = self._date_keys.view("i8").tolist()
+            # Reversed, so a duplicated date maps to its first bar
+            positions = dict(zip(reversed(nanos), range(len(nanos) - 1, -1, -1), strict=True))
+            self._cache["_date_positions"] = positions
+        return positions.get(int(_date_key(date).view("i8")))
+
+    def _col(self, name: str) -> np.ndarray:
+        """Column name as a read-only float64 array (NaN for missing values), converted once and cached."""
+        values = self._cache.get(name)
+        if values is None:
+            # A view, so freezing it never affects an array the frame itself holds
+            values = np.ascontiguousarray(self._df[name].to_numpy(dtype=np.float64, na_value=np.nan)).view()
+            values.flags.writeable = False
+            self._cache[name] = values
+        return values
+
     # ===== Index-based Access =====
 
     @property
     def current(self) -> Bar:
         """Get the most recent bar."""
-        return Bar.from_series(self._df.iloc[-1])
+        return self._bar(-1)
 
     def bar_at(self, index: int) -> Bar:
         """
@@ -105,7 +188,7 @@ class PriceHistory:
             IndexError: If index out of range
         """
         try:
-            return Bar.from_series(self._df.iloc[index])
+            return self._bar(index)
         except IndexError as e:
             raise IndexError(f"Index {index} out of range for history with {len(self)} bars") from e
 
@@ -124,12 +207,11 @@ class PriceHistory:
         Raises:
             KeyError: If date not found
         """
-        date = pd.Timestamp(date).normalize()
-        if date not in self._date_index.index:
+        i = self._date_position(date)
+        if i is None:
             available = f"{self.start_date.date()} to {self.end_date.date()}"
-            raise KeyError(f"Date {date.date()} not found in history. Available range: {available}")
-        idx = self._date_index[date]
-        return Bar.from_series(self._df.iloc[idx])
+            raise KeyError(f"Date {pd.Timestamp(date).date()} not found in history. Available range: {available}")
+        return self._bar(i)
 
     def asof(self, date: str | datetime | pd.Timestamp) -> Bar:
         """
@@ -144,18 +226,13 @@ class PriceHistory:
         Raises:
             ValueError: If date is before earliest data
         """
-        date = pd.Timestamp(date).normalize()
-
-        if date < self._df["date"].iloc[0]:
-            raise ValueError(f"Date {date.date()} is before earliest data ({self._df['date'].iloc[0].date()})")
+        key = _date_key(date)
 
-        idx = self._df["date"].searchsorted(date, side="right") - 1
+        idx = int(np.searchsorted(self._date_keys, key, side="right")) - 1
         if idx < 0:
-            idx = 0
-        elif idx >= len(self._df):
-            idx = len(self._df) - 1
+            raise ValueError(f"Date {pd.Timestamp(key).date()} is before earliest data ({self.start_date.date()})")
 
-        return Bar.from_series(self._df.iloc[idx])
+        return self._bar(idx)
 
     def between(
         self,
@@ -174,27 +251,19 @@ class PriceHistory:
         Returns:
             DataFrame with bars in date range
         """
-        start = pd.Timestamp(start_date).normalize()
-        end = pd.Timestamp(end_date).normalize()
+        start = _date_key(start_date)
+        end = _date_key(end_date)
 
-        mask = pd.Series(True, index=self._df.index)
-
-        if inclusive in ("both", "left"):
-            mask &= self._df["date"] >= start
-        else:
-            mask &= self._df["date"] > start
-
-        if inclusive in ("both", "right"):
-            mask &= self._df["date"] <= end
-        else:
-            mask &= self._df["date"] < end
+        # Dates are sorted, so the range is one contiguous slice found by binary search
+        lo = np.searchsorted(self._date_keys, start, side="left" if inclusive in ("both", "left") else "right")
+        hi = np.searchsorted(self._date_keys, end, side="right" if inclusive in ("both", "right") else "left")
 
-        return self._df[mask].copy()
+        # Copy only the selected rows, so callers cannot write through to the history
+        return self._df.iloc[lo : max(lo, hi)].copy()
 
     def has_date(self, date: str | datetime | pd.Timestamp) -> bool:
         """Check if specific date exists in history."""
-        date = pd.Timestamp(date).normalize()
-        return date in self._date_index.index
+        return self._date_position(date) is not None
 
     # ===== Indicator Access =====
 
@@ -228,21 +297,19 @@ class PriceHistory:
             return None
 
         if date is not None:
-            date_ts = pd.Timestamp(date).normalize()
-            if date_ts not in self._date_index.index:
+            idx = self._date_position(date)
+            if idx is None:
                 return None
-            idx = self._date_index[date_ts]
-            val = self._df.iloc[idx][name]
         elif index is not None:
-            val = self._df.iloc[index][name]
+            idx = index
         else:
             # Use offset from current (most common case)
             idx = -1 - offset
             if abs(idx) > len(self._df):
                 return None
-            val = self._df.iloc[idx][name]
 
-        return float(val) if pd.notna(val) else None
+        val = self._col(name)[idx]
+        return None if np.isnan(val) else float(val)
 
     def has_indicator(self, name: str) -> bool:
         """Check if indicator exists."""
@@ -254,35 +321,32 @@ class PriceHistory:
         """Check if price has been above indicator for n consecutive bars."""
         if indicator not in self._df.columns or len(self._df) < bars:
             return False
-        recent = self._df.tail(bars)
-        return bool((recent["close"] > recent[indicator]).all())
+        return _all_greater(self._close, self._col(indicator), len(self._df) - bars)
 
     def is_below(self, indicator: str, bars: int = 1) -> bool:
         """Check if price has been below indicator for n consecutive bars."""
         if indicator not in self._df.columns or len(self._df) < bars:
             return False
-        recent = self._df.tail(bars)
-        return bool((recent["close"] < recent[indicator]).all())
+        return _all_greater(self._col(indicator), self._close, len(self._df) - bars)
 
     def crossed_above(self, indicator: str, within_bars: int = 1) -> bool:
         """Check if price crossed above indicator within last n bars."""
         if indicator not in self._df.columns or len(self._df) < within_bars + 1:
             return False
 
-        window = self._df.tail(within_bars + 1)
-        was_below = bool(window.iloc[0]["close"] < window.iloc[0][indicator])
-        is_above = bool(window.iloc[-1]["close"] > window.iloc[-1][indicator])
-        return was_below and is_above
+        # Only the first and last bar of the window matter
+        first = len(self._df) - within_bars - 1
+        values = self._col(indicator)
+        return bool(self._close[first] < values[first] and self._close[-1] > values[-1])
 
     def crossed_below(self, indicator: str, within_bars: int = 1) -> bool:
         """Check if price crossed below indicator within last n bars."""
         if indicator not in self._df.columns or len(self._df) < within_bars + 1:
             return False
 
-        window = self._df.tail(within_bars + 1)
-        was_above = bool(window.iloc[0]["close"] > window.iloc[0][indicator])
-        is_below = bool(window.iloc[-1]["close"] < window.iloc[-1][indicator])
-        return was_above and is_below
+        first = len(self._df) - within_bars - 1
+        values = self._col(indicator)
+        return bool(self._close[first] > values[first] and self._close[-1] < values[-1])
 
     # ===== History Access =====
 
@@ -4,14 +4,19 @@ from .ma_ema import (
     calculate_ema,
     calculate_ma,
     calculate_ma_ema,
+    calculate_ma_ema_batch,
     with_ema,
     with_ma,
     with_ma_ema,
 )
 from .macd import (
     calculate_tonghuashun_macd,
+    calculate_tonghuashun_macd_batch,
+    ema_1d,
     find_macd_crossovers,
     tonghuashun_macd,
+    tonghuashun_macd_arrays,
+    tonghuashun_macd_batch,
     with_macd,
 )
 from .tomdemark_sequential import (
@@ -28,11 +33,16 @@ from .weekly_ma_crossovers import (
 __all__ = [
     # DataFrame API (legacy)
     "tonghuashun_macd",
+    "tonghuashun_macd_arrays",
+    "tonghuashun_macd_batch",
     "calculate_tonghuashun_macd",
+    "calculate_tonghuashun_macd_batch",
     "find_macd_crossovers",
+    "ema_1d",
     "calculate_ma",
     "calculate_ema",
     "calculate_ma_ema",
+    "calculate_ma_ema_batch",
     "calculate_weekly_ma",
     "find_ma_crossovers",
     "find_ma_above_ma60",
@@ -0,0 +1,140 @@
+"""
+Internal helpers shared by the indicator modules.
+
+Column auto-detection and the MA/EMA building blocks used by more than one indicator
+live here, so the indicator modules do not import private names from each other.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+try:
+    from numba import njit, prange, types
+except ImportError:  # numba is optional, fall back to NumPy prefix sums
+    njit = None
+
+# Lowercase substrings used to auto-detect the date column of price data, of indicator
+# tables fed to crossover detection, or of either (MACD), and the close column
+_DATE_KEYWORDS = ("date", "timestamp", "日期")
+_CROSSOVER_DATE_KEYWORDS = ("date", "timestamp", "时间")
+_ANY_DATE_KEYWORDS = ("date", "timestamp", "日期", "时间")
+_CLOSE_KEYWORDS = ("close", "收盘")
+
+
+@lru_cache(maxsize=128)
+def _find_col(columns: tuple, keywords: tuple[str, ...]) -> str | None:
+    """
+    Find the first column whose lowercased name contains any of the keywords.
+
+    Memoized on the column tuple, so repeated calls on frames with the same
+    layout (e.g. in a backtesting loop) skip the scan.
+
+    Args:
+        columns: Column labels, as ``tuple(df.columns)``
+        keywords: Lowercase substrings to look for
+
+    Returns:
+        Matching column label, or None if nothing matches
+    """
+    for col in columns:
+        col_lower = col.lower() if isinstance(col, str) else str(col).lower()
+        if any(keyword in col_lower for keyword in keywords):
+            return col
+    return None
+
+
+if njit is not None:
+    # Read-only so the close arrays pandas returns under Copy-on-Write are accepted
+    _CLOSE = types.Array(types.float64, 1, "C", readonly=True)
+
+    @njit(types.void(_CLOSE, types.int64, types.float64[::1]), cache=True, nogil=True)
+    def _ma_sweep(close, period, out):
+        """One MA period as a running-sum sweep over close.
+
+        Matches rolling(window=period, min_periods=1).mean(): leading bars average the
+        bars seen so far and NaNs are skipped. No fastmath, it would drop the NaN checks.
+        """
+        total = 0.0
+        count = 0
+        for i in range(close.shape[0]):
+            x = close[i]
+            if not np.isnan(x):
+                total += x
+                count += 1
+            if i >= period:
+                x = close[i - period]
+                if not np.isnan(x):
+                    total -= x
+                    count -= 1
+            out[i] = total / count if count > 0 else np.nan
+
+    @njit(types.void(_CLOSE, types.int64[::1], types.float64[:, ::1]), cache=True, parallel=True, nogil=True)
+    def _ma_kernel(close, periods, out):
+        """All MA periods in one call, periods in parallel."""
+        for k in prange(periods.shape[0]):
+            _ma_sweep(close, periods[k], out[k])
+
+    @njit(types.void(_CLOSE, types.int64[::1], types.float64[:, ::1]), cache=True, nogil=True)
+    def _ma_kernel_serial(close, periods, out):
+        """All MA periods one after another, for callers that already run on several threads.
+
+        numba's workqueue threading layer (used when neither TBB nor OpenMP is available)
+        aborts the process if a parallel kernel is entered from two threads at once.
+        """
+        for k in range(periods.shape[0]):
+            _ma_sweep(close, periods[k], out[k])
+
+else:
+    _ma_kernel = None
+    _ma_kernel_serial = None
+
+
+def _ema_lfilter(x: np.ndarray, alpha: float) -> np.ndarray:
+    """EMA along the last axis of ``x`` as a first-order IIR filter (scipy lfilter)."""
+    if x.shape[-1] == 0:
+        return np.empty_like(x, dtype=np.float64)
+    # y[i] = alpha * x[i] + (1 - alpha) * y[i-1], seeded so that y[0] = x[0]
+    zi = (1.0 - alpha) * x[..., :1]
+    return lfilter([alpha], [1.0, alpha - 1.0], x, axis=-1, zi=zi)[0]
+
+
+def _ema_ewm(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA along the last axis of ``x`` with pandas ewm, which skips NaN gaps."""
+    # The kernels and lfilter run the plain recurrence, so one NaN would poison every
+    # later value; ewm carries the last EMA across the gap and re-weights the next close
+    frame = pd.DataFrame(np.atleast_2d(x).T)
+    return frame.ewm(span=span, adjust=False).mean().to_numpy().T.reshape(x.shape)
+
+
+def _rolling_means(close: np.ndarray, periods: list[int], parallel: bool = True) -> np.ndarray:
+    """Simple moving averages of ``close`` for each period, as a (len(periods), n) array.
+
+    parallel=False keeps the numba kernel on the calling thread, for use from a thread pool.
+    """
+    if any(period < 1 for period in periods):
+        raise ValueError(f"MA periods must be positive, got {periods}")
+
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    out = np.empty((len(periods), close.shape[0]))
+
+    kernel = _ma_kernel if parallel else _ma_kernel_serial
+    if kernel is not None:
+        kernel(close, np.asarray(periods, dtype=np.int64), out)
+    else:
+        # Prefix sums of the values and of the non-NaN count, computed once for all
+        # periods; each window sum is then a difference of two prefix entries
+        valid = ~np.isnan(close)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(valid, close, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(valid)))
+        ends = np.arange(1, close.shape[0] + 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for k, period in enumerate(periods):
+                # Leading bars average what is available, like min_periods=1
+                starts = np.maximum(ends - period, 0)
+                window_counts = counts[ends] - counts[starts]
+                out[k] = np.where(window_counts > 0, (sums[ends] - sums[starts]) / window_counts, np.nan)
+
+    return out
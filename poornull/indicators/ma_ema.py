@@ -4,15 +4,155 @@ Moving Average (MA) and Exponential Moving Average (EMA) indicators.
 This module provides functions to calculate MA and EMA for different periods.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
 from poornull.data.models import PriceHistory
 
+from ._common import _DATE_KEYWORDS, _ema_lfilter, _find_col, _rolling_means
+
+try:
+    from numba import njit, types
+except ImportError:  # numba is optional, fall back to scipy lfilter
+    njit = None
+
+if njit is not None:
+    # Read-only so the close arrays pandas returns under Copy-on-Write are accepted
+    _CLOSE = types.Array(types.float64, 1, "C", readonly=True)
+
+    @njit(types.void(_CLOSE, types.float64[::1], types.float64[:, ::1]), cache=True, fastmath=True, nogil=True)
+    def _ema_kernel(close, alphas, out):
+        """All EMA periods in a single pass over close, one running state per alpha.
+
+        Matches ewm(span=period, adjust=False).mean() for NaN-free input.
+        """
+        n = close.shape[0]
+        if n == 0:
+            return
+        for k in range(alphas.shape[0]):
+            out[k, 0] = close[0]
+        for i in range(1, n):
+            x = close[i]
+            for k in range(alphas.shape[0]):
+                out[k, i] = out[k, i - 1] + alphas[k] * (x - out[k, i - 1])
+
+else:
+    _ema_kernel = None
+
+
+def _ewm_means(close: np.ndarray, periods: list[int], adjust: bool = False) -> np.ndarray:
+    """Exponential moving averages of ``close`` for each span, as a (len(periods), n) array."""
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    out = np.empty((len(periods), close.shape[0]))
+
+    # The kernel and lfilter implement the plain recurrence only; adjusted EMAs and
+    # NaN gaps (which pandas re-weights) go through ewm
+    if not adjust and not np.isnan(close).any():
+        alphas = np.array([2.0 / (period + 1) for period in periods])
+        if _ema_kernel is not None:
+            _ema_kernel(close, alphas, out)
+        else:
+            for k, alpha in enumerate(alphas):
+                out[k] = _ema_lfilter(close, alpha)
+    else:
+        series = pd.Series(close)
+        for k, period in enumerate(periods):
+            out[k] = series.ewm(span=period, adjust=adjust).mean().to_numpy()
+
+    return out
+
+
+def _close_array(df: pd.DataFrame, close_col: str) -> np.ndarray:
+    """Close prices as the contiguous float64 array the kernels take, converted once per call."""
+    # A no-op for the usual float64 column; float32 or int closes are converted here
+    # once instead of separately by every kernel wrapper
+    return np.ascontiguousarray(df[close_col].to_numpy(dtype=np.float64))
+
+
+def _prepare(df: pd.DataFrame, close_col: str, assume_sorted: bool = False) -> pd.DataFrame:
+    """Return df in date order, as a frame new columns can be added to without touching the caller's."""
+    # Sort by date to ensure proper calculation order. If no date column is found,
+    # sort by the first column as a fallback.
+    sort_col = None if assume_sorted else _find_col(tuple(df.columns), _DATE_KEYWORDS) or df.columns[0]
+
+    if sort_col is None or df[sort_col].is_monotonic_increasing:
+        # Already in order: a shallow copy is enough, since only new columns are assigned
+        df = df.copy(deep=False)
+    else:
+        df = df.sort_values(by=sort_col)
+
+    # Validate close column exists
+    if close_col not in df.columns:
+        raise ValueError(f"Close column '{close_col}' not found in DataFrame. Available columns: {list(df.columns)}")
+
+    return df
+
+
+def _attach_columns(df: pd.DataFrame, names: list[str], values: np.ndarray) -> pd.DataFrame:
+    """Return df with the rows of values, shape (len(names), len(df)), added as columns names."""
+    if len(set(names)) == len(names) and not df.columns.isin(names).any():
+        # One concat for all new columns instead of one insert (and block) per column.
+        # copy=False shares df's columns instead of deep-copying the whole frame (pandas
+        # still consolidates the float64 columns with the new ones)
+        return pd.concat([df, pd.DataFrame(values.T, index=df.index, columns=names)], axis=1, copy=False)
+
+    # Overwriting existing columns (or repeated periods) keeps the column positions
+    for name, column in zip(names, values, strict=True):
+        df[name] = column
+    return df
+
+
+def _add_ma(df: pd.DataFrame, close_col: str, periods: list[int] | None, dtype: type[np.floating]) -> pd.DataFrame:
+    """Return df with MA{period} columns of the given dtype added."""
+    if periods is None:
+        periods = [5, 10, 20, 30, 60]
+
+    # Accumulate in float64 (a float32 running sum drifts), narrow only the result
+    means = _rolling_means(_close_array(df, close_col), periods).astype(dtype, copy=False)
+    return _attach_columns(df, [f"MA{period}" for period in periods], means)
+
+
+def _add_ema(
+    df: pd.DataFrame, close_col: str, periods: list[int] | None, adjust: bool, dtype: type[np.floating]
+) -> pd.DataFrame:
+    """Return df with EMA{period} columns of the given dtype added."""
+    if periods is None:
+        periods = [5, 10, 20, 30, 60]
+
+    means = _ewm_means(_close_array(df, close_col), periods, adjust=adjust).astype(dtype, copy=False)
+    return _attach_columns(df, [f"EMA{period}" for period in periods], means)
+
+
+def _add_ma_ema(
+    df: pd.DataFrame,
+    close_col: str,
+    ma_periods: list[int] | None,
+    ema_periods: list[int] | None,
+    adjust: bool,
+    dtype: type[np.floating],
+    parallel: bool = True,
+) -> pd.DataFrame:
+    """Return df with MA{period} and EMA{period} columns of the given dtype added in one step."""
+    if ma_periods is None:
+        ma_periods = [5, 10, 20, 30, 60]
+    if ema_periods is None:
+        ema_periods = [5, 10, 20, 30, 60]
+
+    close = _close_array(df, close_col)
+    ma = _rolling_means(close, ma_periods, parallel=parallel)
+    ema = _ewm_means(close, ema_periods, adjust=adjust)
+    names = [f"MA{period}" for period in ma_periods] + [f"EMA{period}" for period in ema_periods]
+    return _attach_columns(df, names, np.concatenate((ma, ema)).astype(dtype, copy=False))
+
 
 def calculate_ma(
     df: pd.DataFrame,
     close_col: str = "close",
     periods: list[int] | None = None,
+    assume_sorted: bool = False,
+    dtype: type[np.floating] = np.float64,
 ) -> pd.DataFrame:
     """
     Calculate Simple Moving Average (MA) for specified periods.
@@ -21,6 +161,10 @@ def calculate_ma(
         df: DataFrame with price data. Must have a date/timestamp column and close prices.
         close_col: Column name for closing prices (default "close")
         periods: List of periods for MA calculation (default: [5, 10, 20, 30, 60])
+        assume_sorted: Skip the date-order check and sort, for input the caller has
+            already sorted by date (default: False)
+        dtype: Float dtype of the added columns (default np.float64). np.float32 halves
+            their memory; values are still computed in float64 and keep ~7 significant digits.
 
     Returns:
         DataFrame with added MA columns (MA5, MA10, MA20, etc.)
@@ -33,34 +177,8 @@ def calculate_ma(
         >>> df = calculate_ma(df, close_col="close", periods=[5, 10, 20])
         >>> print(df[["date", "close", "MA5", "MA10", "MA20"]].tail())
     """
-    if periods is None:
-        periods = [5, 10, 20, 30, 60]
-
-    df = df.copy()
-
-    # Sort by date to ensure proper calculation order
-    date_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "date" in col_lower or "timestamp" in col_lower or "日期" in str(col):
-            date_col = col
-            break
-
-    if date_col:
-        df = df.sort_values(by=date_col)
-    else:
-        # If no date column found, sort by first column as fallback
-        df = df.sort_values(by=df.columns[0])
-
-    # Validate close column exists
-    if close_col not in df.columns:
-        raise ValueError(f"Close column '{close_col}' not found in DataFrame. Available columns: {list(df.columns)}")
-
-    # Calculate MA for each period
-    for period in periods:
-        df[f"MA{period}"] = df[close_col].rolling(window=period, min_periods=1).mean()
-
-    return df
+    df = _prepare(df, close_col, assume_sorted)
+    return _add_ma(df, close_col, periods, dtype)
 
 
 def calculate_ema(
@@ -68,6 +186,8 @@ def calculate_ema(
     close_col: str = "close",
     periods: list[int] | None = None,
     adjust: bool = False,
+    assume_sorted: bool = False,
+    dtype: type[np.floating] = np.float64,
 ) -> pd.DataFrame:
     """
     Calculate Exponential Moving Average (EMA) for specified periods.
@@ -77,6 +197,10 @@ def calculate_ema(
         close_col: Column name for closing prices (default "close")
         periods: List of periods for EMA calculation (default: [5, 10, 20, 30, 60])
         adjust: Whether to use adjusted EMA calculation (default: False, matches standard EMA)
+        assume_sorted: Skip the date-order check and sort, for input the caller has
+            already sorted by date (default: False)
+        dtype: Float dtype of the added columns (default np.float64). np.float32 halves
+            their memory; values are still computed in float64 and keep ~7 significant digits.
 
     Returns:
         DataFrame with added EMA columns (EMA5, EMA10, EMA20, etc.)
@@ -89,34 +213,8 @@ def calculate_ema(
         >>> df = calculate_ema(df, close_col="close", periods=[5, 10, 20])
         >>> print(df[["date", "close", "EMA5", "EMA10", "EMA20"]].tail())
     """
-    if periods is None:
-        periods = [5, 10, 20, 30, 60]
-
-    df = df.copy()
-
-    # Sort by date to ensure proper calculation order
-    date_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "date" in col_lower or "timestamp" in col_lower or "日期" in str(col):
-            date_col = col
-            break
-
-    if date_col:
-        df = df.sort_values(by=date_col)
-    else:
-        # If no date column found, sort by first column as fallback
-        df = df.sort_values(by=df.columns[0])
-
-    # Validate close column exists
-    if close_col not in df.columns:
-        raise ValueError(f"Close column '{close_col}' not found in DataFrame. Available columns: {list(df.columns)}")
-
-    # Calculate EMA for each period
-    for period in periods:
-        df[f"EMA{period}"] = df[close_col].ewm(span=period, adjust=adjust).mean()
-
-    return df
+    df = _prepare(df, close_col, assume_sorted)
+    return _add_ema(df, close_col, periods, adjust, dtype)
 
 
 def calculate_ma_ema(
@@ -125,6 +223,8 @@ def calculate_ma_ema(
     ma_periods: list[int] | None = None,
     ema_periods: list[int] | None = None,
     ema_adjust: bool = False,
+    assume_sorted: bool = False,
+    dtype: type[np.floating] = np.float64,
 ) -> pd.DataFrame:
     """
     Calculate both MA and EMA for specified periods.
@@ -135,6 +235,10 @@ def calculate_ma_ema(
         ma_periods: List of periods for MA calculation (default: [5, 10, 20, 30, 60])
         ema_periods: List of periods for EMA calculation (default: [5, 10, 20, 30, 60])
         ema_adjust: Whether to use adjusted EMA calculation (default: False)
+        assume_sorted: Skip the date-order check and sort, for input the caller has
+            already sorted by date (default: False)
+        dtype: Float dtype of the added columns (default np.float64). np.float32 halves
+            their memory; values are still computed in float64 and keep ~7 significant digits.
 
     Returns:
         DataFrame with added MA and EMA columns
@@ -147,9 +251,60 @@ def calculate_ma_ema(
         >>> df = calculate_ma_ema(df, close_col="close", ma_periods=[5, 10], ema_periods=[5, 10])
         >>> print(df[["date", "close", "MA5", "MA10", "EMA5", "EMA10"]].tail())
     """
-    df = calculate_ma(df, close_col=close_col, periods=ma_periods)
-    df = calculate_ema(df, close_col=close_col, periods=ema_periods, adjust=ema_adjust)
-    return df
+    # Sort and validate once for both indicator families
+    df = _prepare(df, close_col, assume_sorted)
+    return _add_ma_ema(df, close_col, ma_periods, ema_periods, ema_adjust, dtype)
+
+
+def calculate_ma_ema_batch(
+    frames: dict[str, pd.DataFrame | None],
+    close_col: str = "close",
+    ma_periods: list[int] | None = None,
+    ema_periods: list[int] | None = None,
+    ema_adjust: bool = False,
+    assume_sorted: bool = False,
+    dtype: type[np.floating] = np.float64,
+    max_workers: int | None = None,
+) -> dict[str, pd.DataFrame | None]:
+    """
+    Calculate MA and EMA for many stocks concurrently.
+
+    The MA/EMA kernels release the GIL, so frames are processed on a thread pool and
+    the numeric work for different stocks runs in parallel. Each frame's MA periods
+    are computed on its own thread rather than by the parallel MA kernel.
+
+    Args:
+        frames: Dictionary mapping stock codes to DataFrames with price data. None
+            entries (failed downloads from download_many) are passed through as None.
+        close_col: Column name for closing prices (default "close")
+        ma_periods: List of periods for MA calculation (default: [5, 10, 20, 30, 60])
+        ema_periods: List of periods for EMA calculation (default: [5, 10, 20, 30, 60])
+        ema_adjust: Whether to use adjusted EMA calculation (default: False)
+        assume_sorted: Skip the date-order check and sort, for frames the caller has
+            already sorted by date (default: False)
+        dtype: Float dtype of the added columns (default np.float64)
+        max_workers: Maximum number of threads (default: ThreadPoolExecutor's default)
+
+    Returns:
+        Dictionary mapping stock codes (in input order) to DataFrames with MA and EMA
+        columns, or None where the input frame was None
+
+    Example:
+        >>> from poornull.data import download_many
+        >>> frames = download_many(["600036", "601398"], "20240101", "20241231")
+        >>> results = calculate_ma_ema_batch(frames, ma_periods=[5, 20], ema_periods=[12, 26])
+        >>> print(results["600036"][["date", "close", "MA5", "EMA12"]].tail())
+    """
+
+    def compute(df: pd.DataFrame | None) -> pd.DataFrame | None:
+        if df is None:
+            return None
+        df = _prepare(df, close_col, assume_sorted)
+        # The parallel MA kernel must not be entered from several threads at once
+        return _add_ma_ema(df, close_col, ma_periods, ema_periods, ema_adjust, dtype, parallel=False)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(frames, executor.map(compute, frames.values()), strict=True))
 
 
 # ===== PriceHistory API =====
@@ -182,8 +337,8 @@ def with_ma(
 
     df = history.df
 
-    for period in periods:
-        df[f"MA{period}"] = df["close"].rolling(window=period, min_periods=1).mean()
+    means = _rolling_means(_close_array(df, "close"), periods)
+    df = _attach_columns(df, [f"MA{period}" for period in periods], means)
 
     return PriceHistory(df)
 
@@ -213,8 +368,8 @@ def with_ema(
 
     df = history.df
 
-    for period in periods:
-        df[f"EMA{period}"] = df["close"].ewm(span=period, adjust=adjust).mean()
+    means = _ewm_means(_close_array(df, "close"), periods, adjust=adjust)
+    df = _attach_columns(df, [f"EMA{period}" for period in periods], means)
 
     return PriceHistory(df)
 
@@ -244,6 +399,5 @@ def with_ma_ema(
         >>> history = with_ma(history, [5, 10, 20, 30, 60, 250])
         >>> history = with_ema(history, [12, 26])
     """
-    history = with_ma(history, periods=ma_periods)
-    history = with_ema(history, periods=ema_periods, adjust=ema_adjust)
-    return history
+    # PriceHistory is always sorted by date, so its frame can be used directly
+    return PriceHistory(_add_ma_ema(history.df, "close", ma_periods, ema_periods, ema_adjust, np.float64))
@@ -8,13 +8,150 @@ This module provides MACD calculation that matches Tonghuashun's values:
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 from poornull.data.models import PriceHistory
 
+from ._common import _ANY_DATE_KEYWORDS, _CLOSE_KEYWORDS, _ema_ewm, _ema_lfilter, _find_col
+
+try:
+    import akshare as ak
+except ImportError:  # akshare is only needed by the fetch helpers, not the indicators
+    ak = None
+
+try:
+    from numba import njit, prange, types
+except ImportError:  # numba is optional, fall back to scipy lfilter
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Categories of the crossover "type" column returned by find_macd_crossovers
+_CROSSOVER_TYPES = ["golden", "death"]
+
+
+def _require_akshare() -> None:
+    """Raise a clear error when the fetch helpers are used without akshare installed."""
+    if ak is None:
+        raise ImportError("akshare is required to fetch stock data; install it with `pip install akshare`")
+
+
+# Explicit signatures make numba compile the kernels eagerly at import time (and,
+# with cache=True, load them from __pycache__ afterwards) instead of on first call.
+# The float32 variants serve tonghuashun_macd(dtype=np.float32).
+# The EMA alphas are runtime arguments on purpose: specializing a kernel per
+# (fast, slow, signal) made no measurable difference on daily-bar series and would
+# add a JIT compile for every new parameter set.
+if njit is not None:
+    # Close inputs are typed read-only: under pandas Copy-on-Write to_numpy() returns
+    # read-only views, and writable arrays still match a read-only parameter
+    _RO_F8 = types.Array(types.float64, 1, "A", readonly=True)
+    _RO_F4 = types.Array(types.float32, 1, "A", readonly=True)
+    _RO_F8_2D = types.Array(types.float64, 2, "C", readonly=True)
+    _F8, _F4 = types.float64, types.float32
+
+    _MACD_FILL_SIGNATURES = [
+        types.void(_RO_F8, _F8, _F8, _F8, _F8, _F8[:], _F8[:], _F8[:]),
+        types.void(_RO_F4, _F8, _F8, _F8, _F8, _F4[:], _F4[:], _F4[:]),
+    ]
+    _MACD_KERNEL_SIGNATURES = [
+        types.UniTuple(_F8[::1], 3)(_RO_F8, _F8, _F8, _F8, _F8),
+        types.UniTuple(_F4[::1], 3)(_RO_F4, _F8, _F8, _F8, _F8),
+    ]
+    _MACD_KERNEL_2D_SIGNATURES = [
+        types.UniTuple(_F8[:, ::1], 3)(_RO_F8_2D, _F8, _F8, _F8, _F8),
+    ]
+
+    @njit(_MACD_FILL_SIGNATURES, cache=True, fastmath=True, nogil=True)
+    def _macd_fill(close, alpha_fast, alpha_slow, alpha_signal, histogram_multiplier, dif_out, dea_out, macd_out):
+        """Fused single-pass MACD: both EMAs, DIF, DEA and the histogram in one loop."""
+        n = close.shape[0]
+        if n == 0:
+            return
+
+        # Seed like ewm(adjust=False): first EMA value is the first input
+        ema_fast = close[0]
+        ema_slow = close[0]
+        dea = 0.0
+        dif_out[0] = 0.0
+        dea_out[0] = 0.0
+        macd_out[0] = 0.0
+        # ema += alpha * (x - ema) is alpha * x + (1 - alpha) * ema rewritten as a
+        # single fused multiply-add, which also shortens the serial dependency chain
+        for i in range(1, n):
+            ema_fast += alpha_fast * (close[i] - ema_fast)
+            ema_slow += alpha_slow * (close[i] - ema_slow)
+            dif = ema_fast - ema_slow
+            dea += alpha_signal * (dif - dea)
+            dif_out[i] = dif
+            dea_out[i] = dea
+            macd_out[i] = (dif - dea) * histogram_multiplier
+
+    @njit(_MACD_KERNEL_SIGNATURES, cache=True, fastmath=True, nogil=True)
+    def _macd_kernel(close, alpha_fast, alpha_slow, alpha_signal, histogram_multiplier):
+        """MACD for a single series, returns (DIF, DEA, MACD) arrays."""
+        dif_out = np.empty_like(close)
+        dea_out = np.empty_like(close)
+        macd_out = np.empty_like(close)
+        _macd_fill(close, alpha_fast, alpha_slow, alpha_signal, histogram_multiplier, dif_out, dea_out, macd_out)
+        return dif_out, dea_out, macd_out
+
+    @njit(_MACD_KERNEL_2D_SIGNATURES, cache=True, fastmath=True, parallel=True)
+    def _macd_kernel_2d(closes, alpha_fast, alpha_slow, alpha_signal, histogram_multiplier):
+        """MACD for a (n_series, n_bars) matrix, one series per row, rows run in parallel."""
+        dif_out = np.empty_like(closes)
+        dea_out = np.empty_like(closes)
+        macd_out = np.empty_like(closes)
+        for k in prange(closes.shape[0]):
+            _macd_fill(
+                closes[k],
+                alpha_fast,
+                alpha_slow,
+                alpha_signal,
+                histogram_multiplier,
+                dif_out[k],
+                dea_out[k],
+                macd_out[k],
+            )
+        return dif_out, dea_out, macd_out
+
+else:
+    _macd_kernel = None
+    _macd_kernel_2d = None
+
+
+def ema_1d(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average of a 1-D array, without pandas.
+
+    Same values as ``pd.Series(values).ewm(span=span, adjust=False).mean()``, computed
+    in a single compiled call to ``scipy.signal.lfilter``. Input with NaN gaps goes
+    through ewm itself.
+
+    Args:
+        values: 1-D array of values in date order
+        span: EMA span, alpha = 2 / (span + 1)
+
+    Returns:
+        float64 array with the EMA values
+
+    Raises:
+        ValueError: If values is not 1-dimensional
+
+    Example:
+        >>> ema12 = ema_1d(df["close"].to_numpy(), span=12)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        raise ValueError(f"values must be a 1-D array, got shape {values.shape}")
+    if np.isnan(values).any():
+        return _ema_ewm(values, span)
+    return _ema_lfilter(values, 2.0 / (span + 1))
+
 
 def tonghuashun_macd(
     df: pd.DataFrame,
@@ -23,6 +160,7 @@ def tonghuashun_macd(
     slow: int = 26,
     signal: int = 9,
     histogram_multiplier: float = 2.0,
+    dtype: type[np.floating] = np.float64,
 ) -> pd.DataFrame:
     """
     Calculate MACD exactly as Tonghuashun does.
@@ -40,6 +178,8 @@ def tonghuashun_macd(
         slow: Slow EMA period (default 26)
         signal: Signal line EMA period (default 9)
         histogram_multiplier: Multiplier for histogram (default 2.0 for Tonghuashun)
+        dtype: Float dtype of the MACD columns (default np.float64). np.float32 halves
+            memory traffic; values stay well within 4-decimal display precision.
 
     Returns:
         DataFrame with added columns:
@@ -54,41 +194,141 @@ def tonghuashun_macd(
         >>> df = tonghuashun_macd(df, close_col='close')
         >>> print(df[['date', 'close', 'DIF', 'DEA', 'MACD']].tail())
     """
-    df = df.copy()
-
     # Sort by date to ensure proper calculation order
-    date_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "date" in col_lower or "timestamp" in col_lower or "日期" in str(col):
-            date_col = col
-            break
-
-    if date_col:
-        df = df.sort_values(by=date_col)
+    date_col = _find_col(tuple(df.columns), _ANY_DATE_KEYWORDS)
+
+    # If no date column found, sort by first column as fallback
+    sort_col = date_col if date_col else df.columns[0]
+
+    if df[sort_col].is_monotonic_increasing:
+        # Already in order (the usual case for akshare data): skip the sort, and
+        # take a shallow copy so the new columns never touch the caller's frame
+        df = df.copy(deep=False)
     else:
-        # If no date column found, sort by first column as fallback
-        df = df.sort_values(by=df.columns[0])
+        df = df.sort_values(by=sort_col)
 
     # Validate close column exists
     if close_col not in df.columns:
         raise ValueError(f"Close column '{close_col}' not found in DataFrame. Available columns: {list(df.columns)}")
 
-    # Calculate EMAs using standard method (adjust=False)
-    ema_fast = df[close_col].ewm(span=fast, adjust=False).mean()
-    ema_slow = df[close_col].ewm(span=slow, adjust=False).mean()
+    dif, dea, macd = tonghuashun_macd_arrays(
+        df[close_col].to_numpy(dtype=dtype), fast, slow, signal, histogram_multiplier
+    )
+    df["DIF"] = dif.astype(dtype, copy=False)
+    df["DEA"] = dea.astype(dtype, copy=False)
+    df["MACD"] = macd.astype(dtype, copy=False)
+    return df
 
-    # MACD line (DIF) = Fast EMA - Slow EMA
-    df["DIF"] = ema_fast - ema_slow
 
-    # Signal line (DEA) = EMA of DIF
-    df["DEA"] = df["DIF"].ewm(span=signal, adjust=False).mean()
+def tonghuashun_macd_arrays(
+    close: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    histogram_multiplier: float = 2.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate Tonghuashun MACD on a NumPy array of closing prices.
+
+    Array-only variant of tonghuashun_macd() for hot loops: no DataFrame is built,
+    sorted or copied. The caller is responsible for passing prices in date order.
+
+    Args:
+        close: 1-D array of closing prices in date order (float32 is kept, anything
+            else is computed as float64)
+        fast: Fast EMA period (default 12)
+        slow: Slow EMA period (default 26)
+        signal: Signal line EMA period (default 9)
+        histogram_multiplier: Multiplier for histogram (default 2.0 for Tonghuashun)
+
+    Returns:
+        Tuple of (DIF, DEA, MACD) arrays, each with the same length as ``close``
+
+    Raises:
+        ValueError: If close is not 1-dimensional
+
+    Example:
+        >>> dif, dea, macd = tonghuashun_macd_arrays(df["close"].to_numpy())
+        >>> print(dif[-1], dea[-1])  # Latest DIF/DEA
+    """
+    close = np.asarray(close)
+    if close.dtype != np.float32:
+        close = close.astype(np.float64, copy=False)
+    if close.ndim != 1:
+        raise ValueError(f"close must be a 1-D array, got shape {close.shape}")
+
+    if np.isnan(close).any():
+        # NaN gaps are skipped like ewm(adjust=False) does
+        dif = _ema_ewm(close, fast) - _ema_ewm(close, slow)
+        dea = _ema_ewm(dif, signal)
+        return dif, dea, (dif - dea) * histogram_multiplier
+
+    if _macd_kernel is not None:
+        # Fused JIT kernel, alpha = 2 / (span + 1) as in ewm(span=...)
+        return _macd_kernel(close, 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1), float(histogram_multiplier))
+
+    # MACD line (DIF) = Fast EMA - Slow EMA, signal line (DEA) = EMA of DIF
+    dif = ema_1d(close, fast) - ema_1d(close, slow)
+    dea = ema_1d(dif, signal)
 
     # Histogram (MACD) = (DIF - DEA) × multiplier
     # Note: Tonghuashun uses 2x multiplier for the histogram display
-    df["MACD"] = (df["DIF"] - df["DEA"]) * histogram_multiplier
+    macd = (dif - dea) * histogram_multiplier
 
-    return df
+    return dif, dea, macd
+
+
+def tonghuashun_macd_batch(
+    closes: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    histogram_multiplier: float = 2.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate Tonghuashun MACD for many series at once.
+
+    Bulk entry point for scanning many stocks: takes a 2-D array of closing prices
+    (one stock per row, bars in date order) and computes all rows in parallel,
+    without any per-stock DataFrame overhead.
+
+    Args:
+        closes: Array of shape (n_stocks, n_bars) with closing prices in date order
+        fast: Fast EMA period (default 12)
+        slow: Slow EMA period (default 26)
+        signal: Signal line EMA period (default 9)
+        histogram_multiplier: Multiplier for histogram (default 2.0 for Tonghuashun)
+
+    Returns:
+        Tuple of (DIF, DEA, MACD) arrays, each with the same shape as ``closes``
+
+    Raises:
+        ValueError: If closes is not 2-dimensional
+
+    Example:
+        >>> closes = np.vstack([df_a["close"].to_numpy(), df_b["close"].to_numpy()])
+        >>> dif, dea, macd = tonghuashun_macd_batch(closes)
+        >>> print(dif[:, -1])  # Latest DIF of each stock
+    """
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    if closes.ndim != 2:
+        raise ValueError(f"closes must be a 2-D array of shape (n_stocks, n_bars), got shape {closes.shape}")
+
+    if np.isnan(closes).any():
+        # NaN gaps are skipped like ewm(adjust=False) does
+        dif = _ema_ewm(closes, fast) - _ema_ewm(closes, slow)
+        dea = _ema_ewm(dif, signal)
+        return dif, dea, (dif - dea) * histogram_multiplier
+
+    if _macd_kernel_2d is not None:
+        return _macd_kernel_2d(
+            closes, 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1), float(histogram_multiplier)
+        )
+
+    # lfilter runs along the last axis, i.e. along each row
+    dif = _ema_lfilter(closes, 2.0 / (fast + 1)) - _ema_lfilter(closes, 2.0 / (slow + 1))
+    dea = _ema_lfilter(dif, 2.0 / (signal + 1))
+    return dif, dea, (dif - dea) * histogram_multiplier
 
 
 def find_macd_crossovers(
@@ -113,7 +353,7 @@ def find_macd_crossovers(
     Returns:
         DataFrame with crossover information:
         - date: Date of crossover
-        - type: "golden" or "death"
+        - type: "golden" or "death" (categorical dtype)
         - dif: DIF value at crossover
         - dea: DEA value at crossover
         - macd: MACD histogram value at crossover
@@ -124,8 +364,6 @@ def find_macd_crossovers(
         >>> crossovers = find_macd_crossovers(df)
         >>> print(crossovers[['date', 'type', 'dif', 'dea']])
     """
-    df = df.copy()
-
     # Validate required columns
     if dif_col not in df.columns:
         raise ValueError(f"DIF column '{dif_col}' not found. Available columns: {list(df.columns)}")
@@ -134,54 +372,51 @@ def find_macd_crossovers(
 
     # Auto-detect date column if not provided
     if date_col is None:
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if "date" in col_lower or "timestamp" in col_lower or "时间" in str(col):
-                date_col = col
-                break
+        date_col = _find_col(tuple(df.columns), _ANY_DATE_KEYWORDS)
 
     if date_col is None:
         date_col = df.columns[0]  # Use first column as fallback
 
     # Sort by date to ensure proper order
-    if date_col in df.columns:
+    if date_col in df.columns and not df[date_col].is_monotonic_increasing:
         df = df.sort_values(by=date_col)
 
-    # Detect crossovers
+    # Detect crossovers on the sign of DIF - DEA
     # Golden cross: DIF was below/equal DEA, now above
     # Death cross: DIF was above/equal DEA, now below
-    df["prev_DIF"] = df[dif_col].shift(1)
-    df["prev_DEA"] = df[dea_col].shift(1)
-
-    # Golden cross: DIF crosses above DEA
-    golden_cross = (df[dif_col] > df[dea_col]) & (df["prev_DIF"] <= df["prev_DEA"])
-
-    # Death cross: DIF crosses below DEA
-    death_cross = (df[dif_col] < df[dea_col]) & (df["prev_DIF"] >= df["prev_DEA"])
-
-    # Combine crossovers
-    df["crossover"] = golden_cross | death_cross
-    df["crossover_type"] = "none"
-    df.loc[golden_cross, "crossover_type"] = "golden"
-    df.loc[death_cross, "crossover_type"] = "death"
-
-    # Extract crossover information
-    crossovers = df[df["crossover"]].copy()
-    if crossovers.empty:
-        return pd.DataFrame(columns=["date", "type", "dif", "dea", "macd", "close_price"])
+    spread = df[dif_col].to_numpy(dtype=np.float64) - df[dea_col].to_numpy(dtype=np.float64)
+    side = np.sign(spread)  # -1 below, 0 equal, +1 above (NaN if missing)
+    step = np.sign(np.diff(side))
+
+    # Crossover code per bar: +1 golden, -1 death, 0 none. A cross is a move that
+    # lands strictly on the new side, i.e. the step direction equals the new side.
+    cross_codes = np.zeros(len(spread), dtype=np.int8)
+    cross_codes[1:] = np.where(side[1:] == step, step, 0)
+
+    # Extract crossover information (positions stay in date order)
+    positions = np.flatnonzero(cross_codes)
+    if positions.size == 0:
+        # Same dtypes as a non-empty result, so e.g. result["type"].cat works on quiet series
+        no_values = np.array([], dtype=np.float64)
+        return pd.DataFrame(
+            {
+                "date": df[date_col].to_numpy()[:0] if date_col in df.columns else np.array([], dtype="datetime64[ns]"),
+                "type": pd.Categorical([], categories=_CROSSOVER_TYPES),
+                "dif": no_values,
+                "dea": no_values,
+                "macd": no_values,
+                "close_price": no_values,
+            }
+        )
+    crossovers = df.iloc[positions]
 
     # Get closing price column if available
-    close_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "close" in col_lower or "收盘" in str(col):
-            close_col = col
-            break
+    close_col = _find_col(tuple(df.columns), _CLOSE_KEYWORDS)
 
     # Build result DataFrame
     result_data = {
         "date": crossovers[date_col],
-        "type": crossovers["crossover_type"],
+        "type": pd.Categorical.from_codes((cross_codes[positions] < 0).astype(np.int8), categories=_CROSSOVER_TYPES),
         "dif": crossovers[dif_col],
         "dea": crossovers[dea_col],
     }
@@ -196,12 +431,7 @@ def find_macd_crossovers(
     if close_col:
         result_data["close_price"] = crossovers[close_col]
 
-    result = pd.DataFrame(result_data)
-
-    # Clean up temporary columns
-    df.drop(columns=["prev_DIF", "prev_DEA", "crossover", "crossover_type"], errors="ignore")
-
-    return result
+    return pd.DataFrame(result_data)
 
 
 def calculate_tonghuashun_macd(
@@ -223,10 +453,14 @@ def calculate_tonghuashun_macd(
     Returns:
         DataFrame with price data and MACD columns (DIF, DEA, MACD)
 
+    Raises:
+        ImportError: If akshare is not installed
+        ValueError: If no data is returned for the stock
+
     Note:
         This function fetches UNADJUSTED prices (不复权) as Tonghuashun uses for MACD.
     """
-    import akshare as ak
+    _require_akshare()
 
     # Fetch UNADJUSTED data (this is what Tonghuashun uses for MACD calculation)
     df = ak.stock_zh_a_hist(
@@ -250,7 +484,7 @@ def calculate_tonghuashun_macd(
         "成交量": "volume",
     }
     df = df.rename(columns=column_mapping)
-    df["date"] = pd.to_datetime(df["date"])
+    df["date"] = pd.to_datetime(df["date"], format="ISO8601", cache=True)
 
     # Use the pure indicator function
     df = tonghuashun_macd(df, close_col="close")
@@ -258,12 +492,49 @@ def calculate_tonghuashun_macd(
     return df
 
 
-def main():
-    """Quick test/debug function for Tonghuashun MACD calculation."""
-    from datetime import datetime, timedelta
+def calculate_tonghuashun_macd_batch(
+    stock_codes: list[str],
+    start_date: str,
+    end_date: str,
+    max_workers: int = 16,
+) -> dict[str, pd.DataFrame | None]:
+    """
+    Fetch data and calculate Tonghuashun MACD for many stocks concurrently.
+
+    The download is network-bound, so stocks are fetched on a thread pool instead of
+    one blocking request after another. The MACD kernel releases the GIL, so the
+    per-stock calculation also runs concurrently on the same threads.
+    A stock that fails is logged as a warning and maps to None, so one bad code does
+    not abort the whole batch (same policy as download_many).
+
+    Args:
+        stock_codes: List of stock codes (e.g., ["600036", "601398"])
+        start_date: Start date in YYYYMMDD format
+        end_date: End date in YYYYMMDD format
+        max_workers: Maximum number of concurrent downloads (default 16)
+
+    Returns:
+        Dictionary mapping stock codes (in input order) to DataFrames with MACD columns,
+        or None for stocks that could not be fetched
+
+    Example:
+        >>> results = calculate_tonghuashun_macd_batch(["600036", "601398"], "20240101", "20241231")
+        >>> print(results["600036"][["date", "DIF", "DEA", "MACD"]].tail())
+    """
+
+    def fetch(stock_code: str) -> pd.DataFrame | None:
+        try:
+            return calculate_tonghuashun_macd(stock_code, start_date, end_date)
+        except Exception as e:
+            logger.warning(f"Failed to calculate MACD for {stock_code}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(stock_codes, executor.map(fetch, stock_codes), strict=True))
 
-    import akshare as ak
 
+def main():
+    """Quick test/debug function for Tonghuashun MACD calculation."""
     # Test with stock 600036
     stock_code = "600036"
     end_date = datetime.now()
@@ -279,6 +550,7 @@ def main():
     try:
         # Fetch data
         logger.info("Fetching data...")
+        _require_akshare()
         df = ak.stock_zh_a_hist(
             symbol=stock_code,
             period="daily",
@@ -301,7 +573,7 @@ def main():
             "成交量": "volume",
         }
         df = df.rename(columns=column_mapping)
-        df["date"] = pd.to_datetime(df["date"])
+        df["date"] = pd.to_datetime(df["date"], format="ISO8601", cache=True)
 
         logger.info(f"Fetched {len(df)} records")
         logger.info(f"   Date range: {df['date'].min()} to {df['date'].max()}")
@@ -319,14 +591,17 @@ def main():
         logger.info("=" * 80)
         logger.info(f"MACD VALUES FOR STOCK {stock_code} (Last 10 days)")
         logger.info("=" * 80)
-        logger.info("\nDate       | Close  |   DIF   |   DEA   |  MACD")
-        logger.info("-" * 60)
-
-        for _, row in df.tail(10).iterrows():
-            date_str = row["date"].strftime("%Y-%m-%d")
-            logger.info(
-                f"{date_str} | {row['close']:6.2f} | {row['DIF']:7.4f} | {row['DEA']:7.4f} | {row['MACD']:6.4f}"
-            )
+        latest = df.tail(10)[["date", "close", "DIF", "DEA", "MACD"]].to_string(
+            index=False,
+            formatters={
+                "date": lambda d: d.strftime("%Y-%m-%d"),
+                "close": "{:6.2f}".format,
+                "DIF": "{:7.4f}".format,
+                "DEA": "{:7.4f}".format,
+                "MACD": "{:6.4f}".format,
+            },
+        )
+        logger.info(f"\n{latest}")
 
         logger.info("\n" + "=" * 80)
         logger.info("Calculation complete!")
@@ -382,18 +657,10 @@ def with_macd(
     """
     df = history.df
 
-    # Calculate EMAs
-    ema_fast = df["close"].ewm(span=fast, adjust=False).mean()
-    ema_slow = df["close"].ewm(span=slow, adjust=False).mean()
-
-    # MACD line (DIF)
-    df["DIF"] = ema_fast - ema_slow
-
-    # Signal line (DEA)
-    df["DEA"] = df["DIF"].ewm(span=signal, adjust=False).mean()
-
-    # Histogram (MACD)
-    df["MACD"] = (df["DIF"] - df["DEA"]) * histogram_multiplier
+    # PriceHistory is always sorted by date, so the array variant can be used directly
+    df["DIF"], df["DEA"], df["MACD"] = tonghuashun_macd_arrays(
+        df["close"].to_numpy(), fast, slow, signal, histogram_multiplier
+    )
 
     return PriceHistory(df)
 
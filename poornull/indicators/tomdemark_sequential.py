@@ -17,6 +17,13 @@ import pandas as pd
 
 from poornull.data.models import PriceHistory
 
+from ._common import _DATE_KEYWORDS, _find_col
+
+try:
+    from numba import njit, types
+except ImportError:  # numba is optional, the state machine then runs as plain Python
+    njit = None
+
 
 class TomDemarkSequentialPhase(IntEnum):
     """Represents the different phases of the TomDemark Sequential indicator."""
@@ -30,6 +37,12 @@ class TomDemarkSequentialPhase(IntEnum):
     SELL_SETUP_PERFECT = 6
 
 
+# Constants from Lean implementation
+_MAX_SETUP_COUNT = 9
+_MAX_COUNTDOWN_COUNT = 13
+_REQUIRED_SAMPLES = 6
+
+
 def calculate_tomdemark_sequential(
     df: pd.DataFrame,
     open_col: str = "open",
@@ -75,20 +88,10 @@ def calculate_tomdemark_sequential(
         >>> df = calculate_tomdemark_sequential(df)
         >>> print(df[["date", "close", "TD_Phase_Name", "TD_Setup_Count", "TD_Countdown_Count"]].tail())
     """
-    # Constants from Lean implementation
-    max_setup_count = 9
-    max_countdown_count = 13
-    required_samples = 6
-
     df = df.copy()
 
     # Sort by date to ensure proper calculation order
-    date_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "date" in col_lower or "timestamp" in col_lower or "日期" in str(col):
-            date_col = col
-            break
+    date_col = _find_col(tuple(df.columns), _DATE_KEYWORDS)
 
     if date_col:
         df = df.sort_values(by=date_col).reset_index(drop=True)
@@ -104,245 +107,212 @@ def calculate_tomdemark_sequential(
             f"Required columns {missing_cols} not found in DataFrame. Available columns: {list(df.columns)}"
         )
 
-    # Initialize result columns
-    df["TD_Phase"] = TomDemarkSequentialPhase.NONE
-    df["TD_Setup_Count"] = 0
-    df["TD_Countdown_Count"] = 0
-    df["TD_Support_Price"] = np.nan
-    df["TD_Resistance_Price"] = np.nan
+    # Run the state machine over plain arrays
+    n = len(df)
+    phase = np.zeros(n, dtype=np.int64)
+    setup = np.zeros(n, dtype=np.int64)
+    countdown = np.zeros(n, dtype=np.int64)
+    support = np.full(n, np.nan)
+    resistance = np.full(n, np.nan)
+    states = _td_sequential_kernel if _td_sequential_kernel is not None else _td_sequential_states
+    states(
+        np.ascontiguousarray(df[close_col].to_numpy(dtype=np.float64)),
+        np.ascontiguousarray(df[high_col].to_numpy(dtype=np.float64)),
+        np.ascontiguousarray(df[low_col].to_numpy(dtype=np.float64)),
+        phase,
+        setup,
+        countdown,
+        support,
+        resistance,
+    )
+
+    df["TD_Phase"] = phase
+    df["TD_Setup_Count"] = setup
+    df["TD_Countdown_Count"] = countdown
+    df["TD_Support_Price"] = support
+    df["TD_Resistance_Price"] = resistance
 
-    # State variables
+    # Add human-readable phase names
+    phase_names = {
+        TomDemarkSequentialPhase.NONE: "None",
+        TomDemarkSequentialPhase.BUY_SETUP: "Buy Setup",
+        TomDemarkSequentialPhase.SELL_SETUP: "Sell Setup",
+        TomDemarkSequentialPhase.BUY_COUNTDOWN: "Buy Countdown",
+        TomDemarkSequentialPhase.SELL_COUNTDOWN: "Sell Countdown",
+        TomDemarkSequentialPhase.BUY_SETUP_PERFECT: "Buy Setup Perfect",
+        TomDemarkSequentialPhase.SELL_SETUP_PERFECT: "Sell Setup Perfect",
+    }
+    df["TD_Phase_Name"] = df["TD_Phase"].map(phase_names)
+
+    return df
+
+
+def _td_sequential_states(close, high, low, phase, setup, countdown, support, resistance):
+    """
+    Run the TD Sequential state machine over price arrays, writing per-bar outputs in place.
+
+    phase/setup/countdown must be zero-filled and support/resistance NaN-filled by the caller.
+    Compiled with numba as _td_sequential_kernel when available; otherwise runs as plain Python.
+    """
+    n = close.shape[0]
     current_phase = TomDemarkSequentialPhase.NONE
     setup_count = 0
     countdown_count = 0
     support_price = np.nan
     resistance_price = np.nan
 
-    # Process each bar
-    for i in range(len(df)):
-        if i < required_samples:
-            # Not enough data yet
-            df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.NONE
-            continue
-
-        # Get current and historical bars
-        current = df.iloc[i]
-        bar_4_ago = df.iloc[i - 4] if i >= 4 else None
-        bar_2_ago = df.iloc[i - 2] if i >= 2 else None
-
+    # Not enough data before _REQUIRED_SAMPLES bars
+    for i in range(_REQUIRED_SAMPLES, n):
         # Initialize setup if nothing is active
         if current_phase == TomDemarkSequentialPhase.NONE:
-            if i >= 5:
-                prev_bar = df.iloc[i - 1]
-                prev_bar_4_ago = df.iloc[i - 5]
-
-                # Bearish flip: prev close > prev close[4] and current close < close[4]
-                if prev_bar[close_col] > prev_bar_4_ago[close_col] and current[close_col] < bar_4_ago[close_col]:
-                    current_phase = TomDemarkSequentialPhase.BUY_SETUP
-                    setup_count = 1
-                    df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.BUY_SETUP
-                    df.at[i, "TD_Setup_Count"] = setup_count
-
-                # Bullish flip: prev close < prev close[4] and current close > close[4]
-                elif prev_bar[close_col] < prev_bar_4_ago[close_col] and current[close_col] > bar_4_ago[close_col]:
-                    current_phase = TomDemarkSequentialPhase.SELL_SETUP
-                    setup_count = 1
-                    df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.SELL_SETUP
-                    df.at[i, "TD_Setup_Count"] = setup_count
+            # Bearish flip: prev close > prev close[4] and current close < close[4]
+            if close[i - 1] > close[i - 5] and close[i] < close[i - 4]:
+                current_phase = TomDemarkSequentialPhase.BUY_SETUP
+                setup_count = 1
+                phase[i] = TomDemarkSequentialPhase.BUY_SETUP
+                setup[i] = setup_count
+
+            # Bullish flip: prev close < prev close[4] and current close > close[4]
+            elif close[i - 1] < close[i - 5] and close[i] > close[i - 4]:
+                current_phase = TomDemarkSequentialPhase.SELL_SETUP
+                setup_count = 1
+                phase[i] = TomDemarkSequentialPhase.SELL_SETUP
+                setup[i] = setup_count
 
         # Handle Buy Setup
         elif current_phase == TomDemarkSequentialPhase.BUY_SETUP:
-            if current[close_col] < bar_4_ago[close_col]:
+            if close[i] < close[i - 4]:
                 setup_count += 1
 
-                if setup_count == max_setup_count:
-                    # Setup complete - check if perfect
-                    setup_bars = df.iloc[i - max_setup_count + 1 : i + 1]
-                    is_perfect = _is_buy_setup_perfect(setup_bars, low_col)
+                if setup_count == _MAX_SETUP_COUNT:
+                    # Setup complete (bars i-8..i) - perfect if bar 8 or 9 has a low below bars 6 and 7
+                    is_perfect = (low[i - 1] < low[i - 3] and low[i - 1] < low[i - 2]) or (
+                        low[i] < low[i - 3] and low[i] < low[i - 2]
+                    )
 
                     # Calculate resistance (highest high of 9-bar setup)
-                    resistance_price = setup_bars[high_col].max()
+                    resistance_price = np.nanmax(high[i - _MAX_SETUP_COUNT + 1 : i + 1])
 
                     # Transition to countdown
                     current_phase = TomDemarkSequentialPhase.BUY_COUNTDOWN
                     countdown_count = 0
 
                     # Check if bar 9 qualifies for countdown
-                    if current[close_col] < bar_2_ago[low_col]:
+                    if close[i] < low[i - 2]:
                         countdown_count = 1
 
-                    phase = (
-                        TomDemarkSequentialPhase.BUY_SETUP_PERFECT if is_perfect else TomDemarkSequentialPhase.BUY_SETUP
-                    )
-                    df.at[i, "TD_Phase"] = phase
-                    df.at[i, "TD_Setup_Count"] = setup_count
-                    df.at[i, "TD_Countdown_Count"] = countdown_count
-                    df.at[i, "TD_Resistance_Price"] = resistance_price
+                    if is_perfect:
+                        phase[i] = TomDemarkSequentialPhase.BUY_SETUP_PERFECT
+                    else:
+                        phase[i] = TomDemarkSequentialPhase.BUY_SETUP
+                    setup[i] = setup_count
+                    countdown[i] = countdown_count
+                    resistance[i] = resistance_price
                     setup_count = 0
                 else:
-                    df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.BUY_SETUP
-                    df.at[i, "TD_Setup_Count"] = setup_count
+                    phase[i] = TomDemarkSequentialPhase.BUY_SETUP
+                    setup[i] = setup_count
             else:
                 # Setup broken
                 current_phase = TomDemarkSequentialPhase.NONE
                 setup_count = 0
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.NONE
 
         # Handle Sell Setup
         elif current_phase == TomDemarkSequentialPhase.SELL_SETUP:
-            if current[close_col] > bar_4_ago[close_col]:
+            if close[i] > close[i - 4]:
                 setup_count += 1
 
-                if setup_count == max_setup_count:
-                    # Setup complete - check if perfect
-                    setup_bars = df.iloc[i - max_setup_count + 1 : i + 1]
-                    is_perfect = _is_sell_setup_perfect(setup_bars, high_col)
+                if setup_count == _MAX_SETUP_COUNT:
+                    # Setup complete (bars i-8..i) - perfect if bar 8 or 9 has a high above bars 6 and 7
+                    is_perfect = (high[i - 1] > high[i - 3] and high[i - 1] > high[i - 2]) or (
+                        high[i] > high[i - 3] and high[i] > high[i - 2]
+                    )
 
                     # Calculate support (lowest low of 9-bar setup)
-                    support_price = setup_bars[low_col].min()
+                    support_price = np.nanmin(low[i - _MAX_SETUP_COUNT + 1 : i + 1])
 
                     # Transition to countdown
                     current_phase = TomDemarkSequentialPhase.SELL_COUNTDOWN
                     countdown_count = 0
 
                     # Check if bar 9 qualifies for countdown
-                    if current[close_col] > bar_2_ago[high_col]:
+                    if close[i] > high[i - 2]:
                         countdown_count = 1
 
-                    phase = (
-                        TomDemarkSequentialPhase.SELL_SETUP_PERFECT
-                        if is_perfect
-                        else TomDemarkSequentialPhase.SELL_SETUP
-                    )
-                    df.at[i, "TD_Phase"] = phase
-                    df.at[i, "TD_Setup_Count"] = setup_count
-                    df.at[i, "TD_Countdown_Count"] = countdown_count
-                    df.at[i, "TD_Support_Price"] = support_price
+                    if is_perfect:
+                        phase[i] = TomDemarkSequentialPhase.SELL_SETUP_PERFECT
+                    else:
+                        phase[i] = TomDemarkSequentialPhase.SELL_SETUP
+                    setup[i] = setup_count
+                    countdown[i] = countdown_count
+                    support[i] = support_price
                     setup_count = 0
                 else:
-                    df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.SELL_SETUP
-                    df.at[i, "TD_Setup_Count"] = setup_count
+                    phase[i] = TomDemarkSequentialPhase.SELL_SETUP
+                    setup[i] = setup_count
             else:
                 # Setup broken
                 current_phase = TomDemarkSequentialPhase.NONE
                 setup_count = 0
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.NONE
 
         # Handle Buy Countdown
         elif current_phase == TomDemarkSequentialPhase.BUY_COUNTDOWN:
             # Check if close breaks resistance (invalidates countdown)
-            if current[close_col] > resistance_price:
+            if close[i] > resistance_price:
                 current_phase = TomDemarkSequentialPhase.NONE
                 countdown_count = 0
                 resistance_price = np.nan
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.NONE
-            elif current[close_col] <= bar_2_ago[low_col]:
+            elif close[i] <= low[i - 2]:
                 # Qualifying countdown bar
                 countdown_count += 1
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.BUY_COUNTDOWN
-                df.at[i, "TD_Countdown_Count"] = countdown_count
-                df.at[i, "TD_Resistance_Price"] = resistance_price
+                phase[i] = TomDemarkSequentialPhase.BUY_COUNTDOWN
+                countdown[i] = countdown_count
+                resistance[i] = resistance_price
 
-                if countdown_count == max_countdown_count:
+                if countdown_count == _MAX_COUNTDOWN_COUNT:
                     # Countdown complete - reset
                     current_phase = TomDemarkSequentialPhase.NONE
                     countdown_count = 0
                     resistance_price = np.nan
             else:
                 # Non-qualifying bar, keep countdown active
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.NONE
-                df.at[i, "TD_Resistance_Price"] = resistance_price
+                resistance[i] = resistance_price
 
         # Handle Sell Countdown
         elif current_phase == TomDemarkSequentialPhase.SELL_COUNTDOWN:
             # Check if close breaks support (invalidates countdown)
-            if current[close_col] < support_price:
+            if close[i] < support_price:
                 current_phase = TomDemarkSequentialPhase.NONE
                 countdown_count = 0
                 support_price = np.nan
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.NONE
-            elif current[close_col] >= bar_2_ago[high_col]:
+            elif close[i] >= high[i - 2]:
                 # Qualifying countdown bar
                 countdown_count += 1
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.SELL_COUNTDOWN
-                df.at[i, "TD_Countdown_Count"] = countdown_count
-                df.at[i, "TD_Support_Price"] = support_price
+                phase[i] = TomDemarkSequentialPhase.SELL_COUNTDOWN
+                countdown[i] = countdown_count
+                support[i] = support_price
 
-                if countdown_count == max_countdown_count:
+                if countdown_count == _MAX_COUNTDOWN_COUNT:
                     # Countdown complete - reset
                     current_phase = TomDemarkSequentialPhase.NONE
                     countdown_count = 0
                     support_price = np.nan
             else:
                 # Non-qualifying bar, keep countdown active
-                df.at[i, "TD_Phase"] = TomDemarkSequentialPhase.NONE
-                df.at[i, "TD_Support_Price"] = support_price
-
-    # Add human-readable phase names
-    phase_names = {
-        TomDemarkSequentialPhase.NONE: "None",
-        TomDemarkSequentialPhase.BUY_SETUP: "Buy Setup",
-        TomDemarkSequentialPhase.SELL_SETUP: "Sell Setup",
-        TomDemarkSequentialPhase.BUY_COUNTDOWN: "Buy Countdown",
-        TomDemarkSequentialPhase.SELL_COUNTDOWN: "Sell Countdown",
-        TomDemarkSequentialPhase.BUY_SETUP_PERFECT: "Buy Setup Perfect",
-        TomDemarkSequentialPhase.SELL_SETUP_PERFECT: "Sell Setup Perfect",
-    }
-    df["TD_Phase_Name"] = df["TD_Phase"].map(phase_names)
-
-    return df
-
-
-def _is_buy_setup_perfect(setup_bars: pd.DataFrame, low_col: str) -> bool:
-    """
-    Check if a buy setup is "perfect".
-
-    A buy setup is perfect if bar 8 or bar 9 has a low less than both bar 6 and bar 7.
-
-    Args:
-        setup_bars: DataFrame containing the 9 setup bars (indexed 0-8)
-        low_col: Name of the low price column
-
-    Returns:
-        True if the setup is perfect, False otherwise
-    """
-    if len(setup_bars) < 9:
-        return False
-
-    bar_6 = setup_bars.iloc[5]
-    bar_7 = setup_bars.iloc[6]
-    bar_8 = setup_bars.iloc[7]
-    bar_9 = setup_bars.iloc[8]
-
-    return (bar_8[low_col] < bar_6[low_col] and bar_8[low_col] < bar_7[low_col]) or (
-        bar_9[low_col] < bar_6[low_col] and bar_9[low_col] < bar_7[low_col]
-    )
-
-
-def _is_sell_setup_perfect(setup_bars: pd.DataFrame, high_col: str) -> bool:
-    """
-    Check if a sell setup is "perfect".
-
-    A sell setup is perfect if bar 8 or bar 9 has a high greater than both bar 6 and bar 7.
-
-    Args:
-        setup_bars: DataFrame containing the 9 setup bars (indexed 0-8)
-        high_col: Name of the high price column
-
-    Returns:
-        True if the setup is perfect, False otherwise
-    """
-    if len(setup_bars) < 9:
-        return False
-
-    bar_6 = setup_bars.iloc[5]
-    bar_7 = setup_bars.iloc[6]
-    bar_8 = setup_bars.iloc[7]
-    bar_9 = setup_bars.iloc[8]
-
-    return (bar_8[high_col] > bar_6[high_col] and bar_8[high_col] > bar_7[high_col]) or (
-        bar_9[high_col] > bar_6[high_col] and bar_9[high_col] > bar_7[high_col]
-    )
+                support[i] = support_price
+
+
+if njit is not None:
+    # close/high/low are read-only under pandas Copy-on-Write; writable arrays match too
+    _PRICES = types.Array(types.float64, 1, "C", readonly=True)
+    _I8, _F8 = types.int64[::1], types.float64[::1]
+    _td_sequential_kernel = njit(
+        types.void(_PRICES, _PRICES, _PRICES, _I8, _I8, _I8, _F8, _F8),
+        cache=True,
+        nogil=True,
+    )(_td_sequential_states)
+else:
+    _td_sequential_kernel = None
 
 
 # ===== PriceHistory API =====
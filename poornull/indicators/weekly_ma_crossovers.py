@@ -5,8 +5,91 @@ This module provides functions to calculate weekly MA values and detect crossove
 between MA20/MA30 and MA60.
 """
 
+import numpy as np
 import pandas as pd
 
+from ._common import _CROSSOVER_DATE_KEYWORDS, _DATE_KEYWORDS, _find_col, _rolling_means
+
+try:
+    from numba import njit, types
+except ImportError:  # numba is optional, fall back to NumPy masks
+    njit = None
+
+# Categories of the crossover "type" column returned by find_ma_crossovers
+_CROSSOVER_TYPES = ["golden_ma20", "death_ma20", "golden_ma30", "death_ma30"]
+# Categories of the "ma_short" column: the MA that crossed MA60
+_SHORT_MA_NAMES = ["MA20", "MA30"]
+
+if njit is not None:
+    # MA columns taken from the frame are read-only under pandas Copy-on-Write
+    _MA = types.Array(types.float64, 1, "C", readonly=True)
+
+    @njit(types.int64(_MA, _MA, _MA, types.int64[::1], types.int8[::1]), cache=True, nogil=True)
+    def _ma_crossover_kernel(ma20, ma30, ma60, rows_out, codes_out):
+        """Single pass over the three MAs, appending (row, type code) for every crossover.
+
+        Codes follow _CROSSOVER_TYPES. NaN comparisons are False, so bars with a missing
+        MA never cross. Returns the number of crossovers written.
+        """
+        count = 0
+        for i in range(1, ma60.shape[0]):
+            # MA20: golden when it was below/equal MA60 and is now above, death the reverse
+            if ma20[i] > ma60[i] and ma20[i - 1] <= ma60[i - 1]:
+                rows_out[count] = i
+                codes_out[count] = 0
+                count += 1
+            elif ma20[i] < ma60[i] and ma20[i - 1] >= ma60[i - 1]:
+                rows_out[count] = i
+                codes_out[count] = 1
+                count += 1
+            # MA30: same rules
+            if ma30[i] > ma60[i] and ma30[i - 1] <= ma60[i - 1]:
+                rows_out[count] = i
+                codes_out[count] = 2
+                count += 1
+            elif ma30[i] < ma60[i] and ma30[i - 1] >= ma60[i - 1]:
+                rows_out[count] = i
+                codes_out[count] = 3
+                count += 1
+        return count
+
+else:
+    _ma_crossover_kernel = None
+
+
+def _crossover_rows(ma20: np.ndarray, ma30: np.ndarray, ma60: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Rows where MA20/MA30 cross MA60 and their _CROSSOVER_TYPES codes, ordered by row."""
+    if _ma_crossover_kernel is not None:
+        # At most one MA20 and one MA30 crossover per bar
+        rows = np.empty(2 * ma60.shape[0], dtype=np.int64)
+        codes = np.empty(2 * ma60.shape[0], dtype=np.int8)
+        count = _ma_crossover_kernel(ma20, ma30, ma60, rows, codes)
+        return rows[:count], codes[:count]
+
+    # Previous values for comparison (NaN on the first row, so it never crosses)
+    prev_ma20 = np.concatenate(([np.nan], ma20[:-1]))
+    prev_ma30 = np.concatenate(([np.nan], ma30[:-1]))
+    prev_ma60 = np.concatenate(([np.nan], ma60[:-1]))
+
+    # One mask per crossover type, in _CROSSOVER_TYPES order
+    masks = np.stack(
+        [
+            # golden_ma20: MA20 was below/equal MA60, now above
+            (ma20 > ma60) & (prev_ma20 <= prev_ma60),
+            # death_ma20: MA20 was above/equal MA60, now below
+            (ma20 < ma60) & (prev_ma20 >= prev_ma60),
+            # golden_ma30: MA30 was below/equal MA60, now above
+            (ma30 > ma60) & (prev_ma30 <= prev_ma60),
+            # death_ma30: MA30 was above/equal MA60, now below
+            (ma30 < ma60) & (prev_ma30 >= prev_ma60),
+        ],
+        axis=1,
+    )
+
+    # Row-major nonzero: rows ascending, types in code order within a row
+    rows, codes = np.nonzero(masks)
+    return rows, codes.astype(np.int8)
+
 
 def calculate_weekly_ma(
     df: pd.DataFrame,
@@ -36,12 +119,7 @@ def calculate_weekly_ma(
     df = df.copy()
 
     # Sort by date to ensure proper calculation order
-    date_col = None
-    for col in df.columns:
-        col_lower = str(col).lower()
-        if "date" in col_lower or "timestamp" in col_lower or "日期" in str(col):
-            date_col = col
-            break
+    date_col = _find_col(tuple(df.columns), _DATE_KEYWORDS)
 
     if date_col:
         df = df.sort_values(by=date_col)
@@ -54,8 +132,9 @@ def calculate_weekly_ma(
         raise ValueError(f"Close column '{close_col}' not found in DataFrame. Available columns: {list(df.columns)}")
 
     # Calculate MA for each period
-    for period in periods:
-        df[f"MA{period}"] = df[close_col].rolling(window=period, min_periods=1).mean()
+    means = _rolling_means(df[close_col].to_numpy(), periods)
+    for period, values in zip(periods, means, strict=True):
+        df[f"MA{period}"] = values
 
     return df
 
@@ -84,7 +163,9 @@ def find_ma_crossovers(
     Returns:
         DataFrame with crossover information:
         - date: Date of crossover
-        - type: "golden_ma20", "death_ma20", "golden_ma30", "death_ma30"
+        - type: "golden_ma20", "death_ma20", "golden_ma30", "death_ma30" (categorical)
+        - is_golden: True for golden crosses, False for death crosses
+        - ma_short: "MA20" or "MA30", the MA that crossed MA60 (categorical)
         - ma20: MA20 value at crossover
         - ma30: MA30 value at crossover
         - ma60: MA60 value at crossover
@@ -97,8 +178,6 @@ def find_ma_crossovers(
         >>> crossovers = find_ma_crossovers(df)
         >>> print(crossovers)
     """
-    df = df.copy()
-
     # Validate required columns
     if ma20_col not in df.columns:
         raise ValueError(f"MA20 column '{ma20_col}' not found. Available columns: {list(df.columns)}")
@@ -109,101 +188,50 @@ def find_ma_crossovers(
 
     # Auto-detect date column if not provided
     if date_col is None:
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if "date" in col_lower or "timestamp" in col_lower or "时间" in str(col):
-                date_col = col
-                break
+        date_col = _find_col(tuple(df.columns), _CROSSOVER_DATE_KEYWORDS)
 
     if date_col is None:
         date_col = df.columns[0]  # Use first column as fallback
 
     # Sort by date to ensure proper order
-    if date_col in df.columns:
+    if date_col in df.columns and not df[date_col].is_monotonic_increasing:
         df = df.sort_values(by=date_col)
 
-    # Detect crossovers
-    # Previous values for comparison
-    df["prev_MA20"] = df[ma20_col].shift(1)
-    df["prev_MA30"] = df[ma30_col].shift(1)
-    df["prev_MA60"] = df[ma60_col].shift(1)
-
-    # MA20 crossovers
-    # Golden cross: MA20 was below/equal MA60, now above
-    ma20_golden = (df[ma20_col] > df[ma60_col]) & (df["prev_MA20"] <= df["prev_MA60"])
-    # Death cross: MA20 was above/equal MA60, now below
-    ma20_death = (df[ma20_col] < df[ma60_col]) & (df["prev_MA20"] >= df["prev_MA60"])
-
-    # MA30 crossovers
-    # Golden cross: MA30 was below/equal MA60, now above
-    ma30_golden = (df[ma30_col] > df[ma60_col]) & (df["prev_MA30"] <= df["prev_MA60"])
-    # Death cross: MA30 was above/equal MA60, now below
-    ma30_death = (df[ma30_col] < df[ma60_col]) & (df["prev_MA30"] >= df["prev_MA60"])
-
-    # Combine all crossovers
-    crossovers_list = []
-
-    # MA20 golden crosses
-    for idx in df[ma20_golden].index:
-        row = df.loc[idx]
-        crossovers_list.append(
-            {
-                "date": row[date_col],
-                "type": "golden_ma20",
-                "ma20": row[ma20_col],
-                "ma30": row[ma30_col],
-                "ma60": row[ma60_col],
-                "close_price": row.get("close", None),
-            }
-        )
+    ma20 = np.ascontiguousarray(df[ma20_col].to_numpy(dtype=np.float64))
+    ma30 = np.ascontiguousarray(df[ma30_col].to_numpy(dtype=np.float64))
+    ma60 = np.ascontiguousarray(df[ma60_col].to_numpy(dtype=np.float64))
 
-    # MA20 death crosses
-    for idx in df[ma20_death].index:
-        row = df.loc[idx]
-        crossovers_list.append(
-            {
-                "date": row[date_col],
-                "type": "death_ma20",
-                "ma20": row[ma20_col],
-                "ma30": row[ma30_col],
-                "ma60": row[ma60_col],
-                "close_price": row.get("close", None),
-            }
-        )
+    # Crossover rows in date order, with one _CROSSOVER_TYPES code per crossover
+    rows, codes = _crossover_rows(ma20, ma30, ma60)
 
-    # MA30 golden crosses
-    for idx in df[ma30_golden].index:
-        row = df.loc[idx]
-        crossovers_list.append(
+    if rows.size == 0:
+        # Same dtypes as a non-empty result, so the categorical and bool columns stay usable
+        no_values = np.array([], dtype=np.float64)
+        return pd.DataFrame(
             {
-                "date": row[date_col],
-                "type": "golden_ma30",
-                "ma20": row[ma20_col],
-                "ma30": row[ma30_col],
-                "ma60": row[ma60_col],
-                "close_price": row.get("close", None),
+                "date": df[date_col].to_numpy()[:0] if date_col in df.columns else np.array([], dtype="datetime64[ns]"),
+                "type": pd.Categorical([], categories=_CROSSOVER_TYPES),
+                "is_golden": np.array([], dtype=bool),
+                "ma_short": pd.Categorical([], categories=_SHORT_MA_NAMES),
+                "ma20": no_values,
+                "ma30": no_values,
+                "ma60": no_values,
+                "close_price": no_values,
             }
         )
 
-    # MA30 death crosses
-    for idx in df[ma30_death].index:
-        row = df.loc[idx]
-        crossovers_list.append(
-            {
-                "date": row[date_col],
-                "type": "death_ma30",
-                "ma20": row[ma20_col],
-                "ma30": row[ma30_col],
-                "ma60": row[ma60_col],
-                "close_price": row.get("close", None),
-            }
-        )
-
-    if not crossovers_list:
-        return pd.DataFrame(columns=["date", "type", "ma20", "ma30", "ma60", "close_price"])
-
-    result = pd.DataFrame(crossovers_list)
-    result = result.sort_values(by="date")
+    result = pd.DataFrame(
+        {
+            "date": df[date_col].to_numpy()[rows],
+            "type": pd.Categorical.from_codes(codes, categories=_CROSSOVER_TYPES),
+            "is_golden": codes % 2 == 0,
+            "ma_short": pd.Categorical.from_codes(codes // 2, categories=_SHORT_MA_NAMES),
+            "ma20": ma20[rows],
+            "ma30": ma30[rows],
+            "ma60": ma60[rows],
+            "close_price": df["close"].to_numpy()[rows] if "close" in df.columns else None,
+        }
+    )
 
     return result
 
@@ -242,8 +270,6 @@ def find_ma_above_ma60(
         >>> above_periods = find_ma_above_ma60(df)
         >>> print(above_periods[above_periods["ma20_above"] | above_periods["ma30_above"]])
     """
-    df = df.copy()
-
     # Validate required columns
     if ma20_col not in df.columns:
         raise ValueError(f"MA20 column '{ma20_col}' not found. Available columns: {list(df.columns)}")
@@ -254,40 +280,37 @@ def find_ma_above_ma60(
 
     # Auto-detect date column if not provided
     if date_col is None:
-        for col in df.columns:
-            col_lower = str(col).lower()
-            if "date" in col_lower or "timestamp" in col_lower or "时间" in str(col):
-                date_col = col
-                break
+        date_col = _find_col(tuple(df.columns), _CROSSOVER_DATE_KEYWORDS)
 
     if date_col is None:
         date_col = df.columns[0]  # Use first column as fallback
 
-    # Sort by date
-    if date_col in df.columns:
+    # Sort by date to ensure proper order
+    if date_col in df.columns and not df[date_col].is_monotonic_increasing:
         df = df.sort_values(by=date_col)
 
     # Find where MA20 or MA30 is above MA60
-    df["ma20_above"] = df[ma20_col] > df[ma60_col]
-    df["ma30_above"] = df[ma30_col] > df[ma60_col]
+    ma20_above = (df[ma20_col] > df[ma60_col]).to_numpy()
+    ma30_above = (df[ma30_col] > df[ma60_col]).to_numpy()
 
-    # Filter to only rows where at least one is above
-    result = df[df["ma20_above"] | df["ma30_above"]].copy()
+    # Rows where at least one is above
+    rows = np.flatnonzero(ma20_above | ma30_above)
 
-    if result.empty:
+    if rows.size == 0:
         return pd.DataFrame(columns=["date", "ma20_above", "ma30_above", "ma20", "ma30", "ma60", "close_price"])
 
     # Select relevant columns
+    index = df.index[rows]
     result_data = {
-        "date": result[date_col],
-        "ma20_above": result["ma20_above"],
-        "ma30_above": result["ma30_above"],
-        "ma20": result[ma20_col],
-        "ma30": result[ma30_col],
-        "ma60": result[ma60_col],
+        "date": df[date_col].iloc[rows],
+        "ma20_above": pd.Series(ma20_above[rows], index=index),
+        "ma30_above": pd.Series(ma30_above[rows], index=index),
+        "ma20": df[ma20_col].iloc[rows],
+        "ma30": df[ma30_col].iloc[rows],
+        "ma60": df[ma60_col].iloc[rows],
     }
 
-    if "close" in result.columns:
-        result_data["close_price"] = result["close"]
+    if "close" in df.columns:
+        result_data["close_price"] = df["close"].iloc[rows]
 
     return pd.DataFrame(result_data)
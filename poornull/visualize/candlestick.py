@@ -17,6 +17,7 @@ def plot_candlesticks(
     up_color: str = "green",
     down_color: str = "red",
     alpha: float = 0.8,
+    dates: pd.Series | None = None,
 ):
     """
     Plot candlestick chart on given axis.
@@ -33,14 +34,17 @@ def plot_candlesticks(
         up_color: Color for up candles (default: "green")
         down_color: Color for down candles (default: "red")
         alpha: Transparency (default: 0.8)
+        dates: Datetimes of the rows of df, e.g. pd.to_datetime(df[date_col]) computed once
+            and shared across plots (default: None, converted from date_col)
     """
-    if date_col is None:
-        date_col = get_date_column(df)
+    if dates is None:
         if date_col is None:
-            raise ValueError("Could not find date column in DataFrame")
+            date_col = get_date_column(df)
+            if date_col is None:
+                raise ValueError("Could not find date column in DataFrame")
 
-    # Convert dates to datetime for proper alignment with other indicators
-    dates = pd.to_datetime(df[date_col])
+        # Convert dates to datetime for proper alignment with other indicators
+        dates = pd.to_datetime(df[date_col])
 
     # Calculate width in days for candlestick rectangles
     if len(dates) > 1:
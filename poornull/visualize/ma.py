@@ -14,6 +14,7 @@ def plot_moving_averages(
     colors: dict | None = None,
     linewidth: float = 1.5,
     alpha: float = 0.8,
+    dates: pd.Series | None = None,
 ):
     """
     Plot moving averages on given axis.
@@ -27,11 +28,15 @@ def plot_moving_averages(
         colors: Dict mapping period to color (default: None, uses default colors)
         linewidth: Line width (default: 1.5)
         alpha: Transparency (default: 0.8)
+        dates: Datetimes of the rows of df, e.g. pd.to_datetime(df[date_col]) computed once
+            and shared across plots (default: None, converted from date_col)
     """
-    if date_col is None:
-        date_col = get_date_column(df)
+    if dates is None:
         if date_col is None:
-            raise ValueError("Could not find date column in DataFrame")
+            date_col = get_date_column(df)
+            if date_col is None:
+                raise ValueError("Could not find date column in DataFrame")
+        dates = pd.to_datetime(df[date_col])
 
     if ma_periods is None:
         # Auto-detect MA columns
@@ -42,8 +47,6 @@ def plot_moving_averages(
     if ma_periods is None:
         ma_periods = [5, 10, 20, 30, 60]
 
-    dates = pd.to_datetime(df[date_col])
-
     # Default colors for common periods
     default_colors = {
         5: "blue",
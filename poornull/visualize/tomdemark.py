@@ -1,5 +1,6 @@
 """TomDeMark Sequential indicator visualization."""
 
+import numpy as np
 import pandas as pd
 
 from poornull.indicators import TomDemarkSequentialPhase
@@ -15,6 +16,7 @@ def plot_tomdemark_sequential(
     setup_marker_size: int = 100,
     countdown_marker_size: int = 50,
     show_annotations: bool = True,
+    dates: pd.Series | None = None,
 ):
     """
     Plot TomDeMark Sequential phases on given axis.
@@ -27,11 +29,15 @@ def plot_tomdemark_sequential(
         setup_marker_size: Size of setup markers (default: 100)
         countdown_marker_size: Size of countdown markers (default: 50)
         show_annotations: Whether to show annotations for completed phases (default: True)
+        dates: Datetimes of the rows of df, e.g. pd.to_datetime(df[date_col]) computed once
+            and shared across plots (default: None, converted from date_col)
     """
-    if date_col is None:
-        date_col = get_date_column(df)
+    if dates is None:
         if date_col is None:
-            raise ValueError("Could not find date column in DataFrame")
+            date_col = get_date_column(df)
+            if date_col is None:
+                raise ValueError("Could not find date column in DataFrame")
+        dates = df[date_col]
 
     # Highlight Buy Setup phases
     buy_setup_mask = df["TD_Phase"].isin(
@@ -40,7 +46,7 @@ def plot_tomdemark_sequential(
     if buy_setup_mask.any():
         buy_setup_data = df[buy_setup_mask]
         ax.scatter(
-            buy_setup_data[date_col],
+            dates[buy_setup_mask.to_numpy()],
             buy_setup_data[close_col],
             color="green",
             marker="^",
@@ -57,7 +63,7 @@ def plot_tomdemark_sequential(
     if sell_setup_mask.any():
         sell_setup_data = df[sell_setup_mask]
         ax.scatter(
-            sell_setup_data[date_col],
+            dates[sell_setup_mask.to_numpy()],
             sell_setup_data[close_col],
             color="red",
             marker="v",
@@ -72,7 +78,7 @@ def plot_tomdemark_sequential(
     if buy_countdown_mask.any():
         buy_countdown_data = df[buy_countdown_mask]
         ax.scatter(
-            buy_countdown_data[date_col],
+            dates[buy_countdown_mask.to_numpy()],
             buy_countdown_data[close_col],
             color="lightgreen",
             marker="o",
@@ -87,7 +93,7 @@ def plot_tomdemark_sequential(
     if sell_countdown_mask.any():
         sell_countdown_data = df[sell_countdown_mask]
         ax.scatter(
-            sell_countdown_data[date_col],
+            dates[sell_countdown_mask.to_numpy()],
             sell_countdown_data[close_col],
             color="lightcoral",
             marker="o",
@@ -144,13 +150,14 @@ def plot_tomdemark_sequential(
 
     # Annotate completed setups (count = 9)
     if show_annotations:
-        completed_setups = df[df["TD_Setup_Count"] == 9]
-        for _, row in completed_setups.iterrows():
-            phase_name = row["TD_Phase_Name"]
+        rows = np.flatnonzero(df["TD_Setup_Count"].to_numpy() == 9)
+        for date, close, phase_name in zip(
+            dates.iloc[rows], df[close_col].iloc[rows], df["TD_Phase_Name"].iloc[rows], strict=True
+        ):
             if "Buy" in phase_name:
                 ax.annotate(
                     "Buy Setup\nComplete",
-                    xy=(row[date_col], row[close_col]),
+                    xy=(date, close),
                     xytext=(10, 20),
                     textcoords="offset points",
                     fontsize=8,
@@ -160,7 +167,7 @@ def plot_tomdemark_sequential(
             elif "Sell" in phase_name:
                 ax.annotate(
                     "Sell Setup\nComplete",
-                    xy=(row[date_col], row[close_col]),
+                    xy=(date, close),
                     xytext=(10, -30),
                     textcoords="offset points",
                     fontsize=8,
@@ -169,13 +176,14 @@ def plot_tomdemark_sequential(
                 )
 
         # Annotate completed countdowns (count = 13)
-        completed_countdowns = df[df["TD_Countdown_Count"] == 13]
-        for _, row in completed_countdowns.iterrows():
-            phase_name = row["TD_Phase_Name"]
+        rows = np.flatnonzero(df["TD_Countdown_Count"].to_numpy() == 13)
+        for date, close, phase_name in zip(
+            dates.iloc[rows], df[close_col].iloc[rows], df["TD_Phase_Name"].iloc[rows], strict=True
+        ):
             if "Buy" in phase_name:
                 ax.annotate(
                     "Buy Countdown\nComplete!",
-                    xy=(row[date_col], row[close_col]),
+                    xy=(date, close),
                     xytext=(10, 30),
                     textcoords="offset points",
                     fontsize=9,
@@ -186,7 +194,7 @@ def plot_tomdemark_sequential(
             elif "Sell" in phase_name:
                 ax.annotate(
                     "Sell Countdown\nComplete!",
-                    xy=(row[date_col], row[close_col]),
+                    xy=(date, close),
                     xytext=(10, -40),
                     textcoords="offset points",
                     fontsize=9,
@@ -196,7 +204,7 @@ def plot_tomdemark_sequential(
                 )
 
 
-def plot_tomdemark_counters(ax, df: pd.DataFrame, date_col: str | None = None):
+def plot_tomdemark_counters(ax, df: pd.DataFrame, date_col: str | None = None, dates: pd.Series | None = None):
     """
     Plot TD Sequential setup and countdown counters.
 
@@ -204,13 +212,15 @@ def plot_tomdemark_counters(ax, df: pd.DataFrame, date_col: str | None = None):
         ax: Matplotlib axis to plot on
         df: DataFrame with TD Sequential columns
         date_col: Name of date column (auto-detected if None)
+        dates: Datetimes of the rows of df, e.g. pd.to_datetime(df[date_col]) computed once
+            and shared across plots (default: None, converted from date_col)
     """
-    if date_col is None:
-        date_col = get_date_column(df)
+    if dates is None:
         if date_col is None:
-            raise ValueError("Could not find date column in DataFrame")
-
-    dates = pd.to_datetime(df[date_col])
+            date_col = get_date_column(df)
+            if date_col is None:
+                raise ValueError("Could not find date column in DataFrame")
+        dates = pd.to_datetime(df[date_col])
 
     ax.bar(
         dates,
@@ -19,6 +19,7 @@ def plot_trendlines(
     linewidth: float = 1.5,
     alpha: float = 0.6,
     label: str = "Trendline",
+    dates: pd.Series | None = None,
 ):
     """
     Plot trendlines on given axis.
@@ -35,13 +36,15 @@ def plot_trendlines(
         linewidth: Line width (default: 1.5)
         alpha: Transparency (default: 0.6)
         label: Label for legend (default: "Trendline")
+        dates: Datetimes of the rows of df, e.g. pd.to_datetime(df[date_col]) computed once
+            and shared across plots (default: None, converted from date_col)
     """
-    if date_col is None:
-        date_col = get_date_column(df)
+    if dates is None:
         if date_col is None:
-            raise ValueError("Could not find date column in DataFrame")
-
-    dates = pd.to_datetime(df[date_col])
+            date_col = get_date_column(df)
+            if date_col is None:
+                raise ValueError("Could not find date column in DataFrame")
+        dates = pd.to_datetime(df[date_col])
 
     # Use subset if lookback specified
     if lookback is not None and lookback < len(df):
@@ -96,16 +99,18 @@ def plot_trendlines(
 
         # Calculate support (local minima)
         rolling_min = df_subset[price_col].rolling(window=window, center=True).min()
-        support_levels = df_subset[df_subset[price_col] == rolling_min]
+        support_mask = (df_subset[price_col] == rolling_min).to_numpy()
+        support_levels = df_subset[support_mask]
 
         # Calculate resistance (local maxima)
         rolling_max = df_subset[price_col].rolling(window=window, center=True).max()
-        resistance_levels = df_subset[df_subset[price_col] == rolling_max]
+        resistance_mask = (df_subset[price_col] == rolling_max).to_numpy()
+        resistance_levels = df_subset[resistance_mask]
 
         # Plot support
         if not support_levels.empty:
             ax.scatter(
-                support_levels[date_col],
+                dates_subset[support_mask],
                 support_levels[price_col],
                 color="green",
                 marker="_",
@@ -128,7 +133,7 @@ def plot_trendlines(
         # Plot resistance
         if not resistance_levels.empty:
             ax.scatter(
-                resistance_levels[date_col],
+                dates_subset[resistance_mask],
                 resistance_levels[price_col],
                 color="red",
                 marker="_",
@@ -0,0 +1,120 @@
+"""Tests for the on-disk data cache."""
+
+import os
+import time
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from poornull.data import cache, load_or_fetch
+
+
+@pytest.fixture
+def sample_df():
+    """Create a small OHLCV frame."""
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-01", periods=5, freq="D"),
+            "close": [10.0, 10.5, 11.0, 10.8, 11.2],
+            "volume": [100.0, 120.0, 90.0, 110.0, 130.0],
+        }
+    )
+
+
+class TestLoadOrFetch:
+    """Test load_or_fetch function."""
+
+    def test_miss_calls_fetcher_and_writes_entry(self, tmp_path, sample_df):
+        """Test that a cache miss downloads and stores the frame."""
+        fetcher = Mock(return_value=sample_df)
+
+        result = load_or_fetch(("daily", "600036"), fetcher, cache_dir=tmp_path)
+
+        fetcher.assert_called_once()
+        pd.testing.assert_frame_equal(result, sample_df)
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_hit_skips_fetcher(self, tmp_path, sample_df):
+        """Test that a cache hit returns the stored frame without downloading."""
+        load_or_fetch(("daily", "600036"), Mock(return_value=sample_df), cache_dir=tmp_path)
+        fetcher = Mock(return_value=sample_df)
+
+        result = load_or_fetch(("daily", "600036"), fetcher, cache_dir=tmp_path)
+
+        fetcher.assert_not_called()
+        pd.testing.assert_frame_equal(result, sample_df)
+
+    def test_different_keys_do_not_collide(self, tmp_path, sample_df):
+        """Test that each key gets its own entry."""
+        load_or_fetch(("daily", "600036"), Mock(return_value=sample_df), cache_dir=tmp_path)
+        fetcher = Mock(return_value=sample_df.head(2))
+
+        result = load_or_fetch(("daily", "000001"), fetcher, cache_dir=tmp_path)
+
+        fetcher.assert_called_once()
+        assert len(result) == 2
+
+    def test_expired_entry_is_refetched(self, tmp_path, sample_df):
+        """Test that entries older than max_age are downloaded again."""
+        load_or_fetch(("daily", "600036"), Mock(return_value=sample_df), cache_dir=tmp_path)
+        (entry,) = tmp_path.iterdir()
+        old = time.time() - 7200
+        os.utime(entry, (old, old))
+        fetcher = Mock(return_value=sample_df.head(3))
+
+        result = load_or_fetch(("daily", "600036"), fetcher, max_age=timedelta(hours=1), cache_dir=tmp_path)
+
+        fetcher.assert_called_once()
+        assert len(result) == 3
+
+    def test_fetcher_error_is_not_cached(self, tmp_path):
+        """Test that a failing download propagates and leaves no entry."""
+        fetcher = Mock(side_effect=ValueError("No data found for stock 600036"))
+
+        with pytest.raises(ValueError, match="No data found"):
+            load_or_fetch(("daily", "600036"), fetcher, cache_dir=tmp_path)
+
+        assert not tmp_path.exists() or not list(tmp_path.iterdir())
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path, sample_df, monkeypatch):
+        """Test that a write error is logged and its temporary file removed."""
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(cache.os, "replace", fail_replace)
+
+        result = load_or_fetch(("daily", "600036"), Mock(return_value=sample_df), cache_dir=tmp_path)
+
+        pd.testing.assert_frame_equal(result, sample_df)
+        assert not list(tmp_path.iterdir())
+
+    @pytest.mark.parametrize("use_pyarrow", [True, False])
+    def test_index_round_trips(self, tmp_path, sample_df, monkeypatch, use_pyarrow):
+        """Test that a non-default index survives the cache with either backend."""
+        if not use_pyarrow:
+            monkeypatch.setattr(cache, "pyarrow", None)
+            monkeypatch.setattr(cache, "_CACHE_SUFFIX", ".pkl")
+        elif cache.pyarrow is None:
+            pytest.skip("pyarrow is not installed")
+        indexed = sample_df.set_index("date")
+        load_or_fetch(("daily", "600036"), Mock(return_value=indexed), cache_dir=tmp_path)
+
+        result = load_or_fetch(("daily", "600036"), Mock(return_value=indexed), cache_dir=tmp_path)
+
+        pd.testing.assert_frame_equal(result, indexed)
+
+    def test_pickle_fallback_without_pyarrow(self, tmp_path, sample_df, monkeypatch):
+        """Test that frames round-trip through pickle when pyarrow is unavailable."""
+        monkeypatch.setattr(cache, "pyarrow", None)
+        monkeypatch.setattr(cache, "_CACHE_SUFFIX", ".pkl")
+        load_or_fetch(("daily", "600036"), Mock(return_value=sample_df), cache_dir=tmp_path)
+        fetcher = Mock(return_value=sample_df)
+
+        result = load_or_fetch(("daily", "600036"), fetcher, cache_dir=tmp_path)
+
+        fetcher.assert_not_called()
+        assert next(tmp_path.iterdir()).suffix == ".pkl"
+        pd.testing.assert_frame_equal(result, sample_df)
@@ -2,15 +2,19 @@
 
 from unittest.mock import Mock, patch
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from poornull.data import (
     Period,
     download_daily,
+    download_many,
     download_monthly,
     download_quarterly,
     download_stock_data,
     download_weekly,
+    resample_ohlcv,
 )
 
 
@@ -124,6 +128,30 @@ class TestDownloadStockData:
         with pytest.raises(ValueError, match="No data found for stock"):
             download_stock_data("600036", "20240101", "20241231", period=Period.DAILY)
 
+    @patch("poornull.data.download.ak.stock_zh_a_hist")
+    def test_dates_are_parsed_and_sorted(self, mock_akshare):
+        """Test that the date column is parsed and rows come out in date order."""
+        mock_akshare.return_value = pd.DataFrame(
+            {"日期": ["2024-01-03", "2024-01-02", "2024-01-04"], "收盘": [11.0, 10.0, 12.0]}
+        )
+
+        result = download_stock_data("600036", "20240101", "20241231")
+
+        assert pd.api.types.is_datetime64_any_dtype(result["date"])
+        assert list(result["close"]) == [10.0, 11.0, 12.0]
+
+    @patch("poornull.data.download.ak.stock_zh_a_hist")
+    def test_float32_prices(self, mock_akshare):
+        """Test that price_dtype narrows OHLC columns and leaves volume alone."""
+        mock_akshare.return_value = pd.DataFrame(
+            {"日期": ["2024-01-02"], "开盘": [10.0], "收盘": [10.5], "最高": [11.0], "最低": [9.5], "成交量": [12345]}
+        )
+
+        result = download_stock_data("600036", "20240101", "20241231", price_dtype=np.float32)
+
+        assert (result[["open", "high", "low", "close"]].dtypes == np.float32).all()
+        assert result["volume"].dtype == np.int64
+
     @patch("poornull.data.download.ak.stock_zh_a_hist")
     def test_adjust_parameter(self, mock_akshare):
         """Test that adjust parameter is passed correctly."""
@@ -175,3 +203,102 @@ class TestConvenienceWrappers:
         mock_download.return_value = Mock()
         download_quarterly("600036", "20240101", "20241231")
         mock_download.assert_called_once_with("600036", "20240101", "20241231", period=Period.QUARTERLY, adjust="")
+
+
+class TestDownloadMany:
+    """Test download_many function."""
+
+    @patch("poornull.data.download.download_stock_data")
+    def test_returns_frame_per_code_in_order(self, mock_download):
+        """Test that every code is downloaded and results keep the input order."""
+        mock_download.side_effect = lambda code, *args, **kwargs: pd.DataFrame({"code": [code]})
+
+        result = download_many(["600519", "600036", "000001"], "20240101", "20241231", period=Period.WEEKLY)
+
+        assert list(result) == ["600519", "600036", "000001"]
+        assert result["600036"]["code"].iloc[0] == "600036"
+        mock_download.assert_any_call("600036", "20240101", "20241231", period=Period.WEEKLY, adjust="")
+        assert mock_download.call_count == 3
+
+    @patch("poornull.data.download.download_stock_data")
+    def test_failed_download_is_none(self, mock_download):
+        """Test that a failing stock maps to None without aborting the batch."""
+
+        def fake_download(code, *args, **kwargs):
+            if code == "000000":
+                raise ValueError(f"No data found for stock {code}")
+            return pd.DataFrame({"code": [code]})
+
+        mock_download.side_effect = fake_download
+
+        result = download_many(["600036", "000000"], "20240101", "20241231")
+
+        assert result["000000"] is None
+        assert result["600036"] is not None
+
+
+class TestResampleOHLCV:
+    """Test resample_ohlcv function."""
+
+    @pytest.fixture
+    def daily_df(self):
+        """Create 60 business days of daily bars."""
+        dates = pd.bdate_range("2024-01-01", periods=60)
+        values = np.arange(60, dtype=float)
+        return pd.DataFrame(
+            {
+                "date": dates,
+                "open": values,
+                "close": values + 1,
+                "high": values + 2,
+                "low": values - 1,
+                "volume": np.ones(60),
+                "pct_change": np.zeros(60),
+            }
+        )
+
+    def test_daily_is_unchanged(self, daily_df):
+        """Test that resampling to daily returns the input."""
+        assert resample_ohlcv(daily_df, Period.DAILY) is daily_df
+
+    def test_weekly_aggregation(self, daily_df):
+        """Test that weekly bars aggregate open/high/low/close/volume correctly."""
+        weekly = resample_ohlcv(daily_df, Period.WEEKLY)
+
+        assert len(weekly) == 12
+        first = weekly.iloc[0]
+        assert first["date"] == pd.Timestamp("2024-01-05")
+        assert first["open"] == 0.0
+        assert first["close"] == 5.0
+        assert first["high"] == 6.0
+        assert first["low"] == -1.0
+        assert first["volume"] == 5.0
+
+    def test_monthly_dated_on_last_trading_day(self, daily_df):
+        """Test that monthly bars are dated on the last trading day in the month."""
+        monthly = resample_ohlcv(daily_df, Period.MONTHLY)
+
+        assert list(monthly["date"]) == [
+            pd.Timestamp("2024-01-31"),
+            pd.Timestamp("2024-02-29"),
+            pd.Timestamp("2024-03-22"),
+        ]
+        assert monthly["volume"].sum() == 60
+
+    def test_drops_columns_that_cannot_be_aggregated(self, daily_df):
+        """Test that derived columns are not carried into resampled bars."""
+        weekly = resample_ohlcv(daily_df, Period.WEEKLY)
+        assert "pct_change" not in weekly.columns
+
+    def test_skips_periods_without_trading_days(self, daily_df):
+        """Test that holiday weeks do not produce empty bars."""
+        holiday_df = daily_df[(daily_df["date"] < "2024-01-08") | (daily_df["date"] > "2024-01-12")]
+        weekly = resample_ohlcv(holiday_df, Period.WEEKLY)
+
+        assert len(weekly) == 11
+        assert not weekly["close"].isna().any()
+
+    def test_missing_date_column_raises_error(self, daily_df):
+        """Test that a missing date column raises ValueError."""
+        with pytest.raises(ValueError, match="Date column 'date' not found"):
+            resample_ohlcv(daily_df.drop(columns=["date"]), Period.WEEKLY)
@@ -6,6 +6,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from poornull.data import models
 from poornull.data.models import Bar, PriceHistory, Signal
 
 
@@ -110,6 +111,17 @@ class TestPriceHistory:
         assert history.start_date.date() == datetime(2024, 1, 1).date()
         assert history.end_date.date() == datetime(2024, 1, 3).date()
 
+    def test_init_parses_string_dates(self, sample_df):
+        sample_df["date"] = sample_df["date"].dt.strftime("%Y-%m-%d")
+        history = PriceHistory(sample_df.iloc[::-1])
+        assert history.start_date == pd.Timestamp("2024-01-01")
+        assert history.on("2024-01-05").close == 105.0
+
+    def test_init_does_not_alias_input(self, sample_df):
+        history = PriceHistory(sample_df)
+        sample_df.loc[0, "close"] = 999.0
+        assert history.df["close"].iloc[0] == 101.0
+
     # ===== Index-based Access Tests =====
 
     def test_current_bar(self, sample_df):
@@ -210,6 +222,12 @@ class TestPriceHistory:
         assert df.iloc[0]["close"] == 104.0
         assert df.iloc[-1]["close"] == 106.0
 
+    def test_between_does_not_alias_history(self, sample_df):
+        history = PriceHistory(sample_df)
+        df = history.between("2024-01-03", "2024-01-07")
+        df.loc[df.index[0], "close"] = 999.0
+        assert history.df["close"].iloc[2] == 103.0
+
     # ===== Indicator Access Tests =====
 
     def test_indicator_by_index(self, sample_df_with_indicators):
@@ -287,6 +305,35 @@ class TestPriceHistory:
         history = PriceHistory(df)
         assert history.is_below("MA250", bars=1) is True
 
+    def test_is_above_nan_indicator_false(self, sample_df_with_indicators):
+        history = PriceHistory(sample_df_with_indicators)
+        # MA10 is NaN until the last bar
+        assert history.is_above("MA10", bars=2) is False
+        assert history.is_below("MA10", bars=2) is False
+
+    def test_is_above_numpy_fallback(self, sample_df_with_indicators, monkeypatch):
+        monkeypatch.setattr(models, "_all_greater_kernel", None)
+        history = PriceHistory(sample_df_with_indicators)
+        assert history.is_above("MA250", bars=10) is True
+        assert history.is_above("MA10", bars=2) is False
+        assert history.is_below("MA250", bars=1) is False
+
+    def test_cached_arrays_are_read_only(self, sample_df_with_indicators):
+        history = PriceHistory(sample_df_with_indicators)
+        close = history._col("close")
+
+        assert not close.flags.writeable
+        with pytest.raises(ValueError):
+            close[0] = 0.0
+        assert history.is_above("MA250", bars=10) is True
+        assert history.df["close"].to_numpy().flags.writeable
+
+    def test_is_above_copy_on_write(self, sample_df_with_indicators):
+        with pd.option_context("mode.copy_on_write", True):
+            history = PriceHistory(sample_df_with_indicators)
+            assert history.is_above("MA250", bars=10) is True
+            assert history.is_below("MA250", bars=1) is False
+
     def test_crossed_above_true(self):
         df = pd.DataFrame(
             {
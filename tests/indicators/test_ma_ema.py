@@ -0,0 +1,203 @@
+"""Tests for MA/EMA indicators."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from poornull.indicators import _common, calculate_ema, calculate_ma, calculate_ma_ema, calculate_ma_ema_batch, ma_ema
+
+
+class TestCalculateMA:
+    """Test calculate_ma function."""
+
+    def test_matches_pandas_rolling(self, sample_stock_data):
+        """Test that MA values match rolling(min_periods=1).mean()."""
+        result = calculate_ma(sample_stock_data, periods=[5, 20, 250])
+
+        for period in [5, 20, 250]:
+            expected = sample_stock_data["close"].rolling(window=period, min_periods=1).mean()
+            np.testing.assert_allclose(result[f"MA{period}"], expected, rtol=1e-10)
+
+    def test_leading_bars_average_available_data(self):
+        """Test that bars before a full window average the bars seen so far."""
+        df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=4), "close": [1.0, 2.0, 3.0, 4.0]})
+        result = calculate_ma(df, periods=[3])
+        assert list(result["MA3"]) == [1.0, 1.5, 2.0, 3.0]
+
+    def test_nan_close_is_skipped(self):
+        """Test that NaN closes are skipped like pandas rolling does."""
+        close = pd.Series([1.0, np.nan, 3.0, 4.0, np.nan, np.nan, np.nan, 8.0])
+        df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=8), "close": close})
+
+        result = calculate_ma(df, periods=[2, 3])
+
+        for period in [2, 3]:
+            expected = close.rolling(window=period, min_periods=1).mean()
+            np.testing.assert_allclose(result[f"MA{period}"], expected, rtol=1e-12)
+
+    def test_pandas_fallback(self, sample_stock_data, monkeypatch):
+        """Test that results are the same without the numba kernel."""
+        expected = calculate_ma(sample_stock_data, periods=[5, 60])
+        monkeypatch.setattr(_common, "_ma_kernel", None)
+        result = calculate_ma(sample_stock_data, periods=[5, 60])
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-10)
+
+    def test_fallback_nan_close_is_skipped(self, monkeypatch):
+        """Test that the prefix-sum fallback skips NaN closes like pandas rolling does."""
+        monkeypatch.setattr(_common, "_ma_kernel", None)
+        close = pd.Series([np.nan, 1.0, np.nan, 3.0, 4.0, np.nan, np.nan, np.nan, 8.0])
+        df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=9), "close": close})
+
+        result = calculate_ma(df, periods=[1, 2, 3])
+
+        for period in [1, 2, 3]:
+            expected = close.rolling(window=period, min_periods=1).mean()
+            np.testing.assert_allclose(result[f"MA{period}"], expected, rtol=1e-12)
+
+    def test_non_positive_period_raises_error(self, sample_stock_data):
+        """Test that a period below 1 raises ValueError."""
+        with pytest.raises(ValueError, match="MA periods must be positive"):
+            calculate_ma(sample_stock_data, periods=[5, 0])
+
+    def test_missing_close_column_raises_error(self, sample_stock_data):
+        """Test that a missing close column raises ValueError."""
+        with pytest.raises(ValueError, match="Close column 'price' not found"):
+            calculate_ma(sample_stock_data, close_col="price")
+
+
+class TestCalculateEMA:
+    """Test calculate_ema function."""
+
+    def test_matches_pandas_ewm(self, sample_stock_data):
+        """Test that EMA values match ewm(span, adjust=False).mean()."""
+        result = calculate_ema(sample_stock_data, periods=[5, 12, 60])
+
+        for period in [5, 12, 60]:
+            expected = sample_stock_data["close"].ewm(span=period, adjust=False).mean()
+            np.testing.assert_allclose(result[f"EMA{period}"], expected, rtol=1e-10)
+
+    def test_adjusted_ema(self, sample_stock_data):
+        """Test that adjust=True matches the adjusted pandas EMA."""
+        result = calculate_ema(sample_stock_data, periods=[12], adjust=True)
+        expected = sample_stock_data["close"].ewm(span=12, adjust=True).mean()
+        np.testing.assert_allclose(result["EMA12"], expected, rtol=1e-10)
+
+    def test_nan_close_matches_pandas(self):
+        """Test that NaN gaps are weighted like pandas ewm."""
+        close = pd.Series([1.0, 2.0, np.nan, 4.0, 5.0, np.nan, 7.0])
+        df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=7), "close": close})
+
+        result = calculate_ema(df, periods=[3])
+
+        np.testing.assert_allclose(result["EMA3"], close.ewm(span=3, adjust=False).mean(), rtol=1e-12)
+
+    def test_pandas_fallback(self, sample_stock_data, monkeypatch):
+        """Test that results are the same without the numba kernel."""
+        expected = calculate_ema(sample_stock_data, periods=[5, 26])
+        monkeypatch.setattr(ma_ema, "_ema_kernel", None)
+        result = calculate_ema(sample_stock_data, periods=[5, 26])
+        pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-10)
+
+
+class TestCalculateMAEMA:
+    """Test calculate_ma_ema function."""
+
+    def test_adds_ma_and_ema_columns(self, sample_stock_data):
+        """Test that both MA and EMA columns are added."""
+        result = calculate_ma_ema(sample_stock_data, ma_periods=[5, 10], ema_periods=[12])
+        assert {"MA5", "MA10", "EMA12"} <= set(result.columns)
+
+    def test_does_not_modify_input(self, sample_stock_data):
+        """Test that the input DataFrame is not modified."""
+        original = sample_stock_data.copy()
+        calculate_ma_ema(sample_stock_data)
+        pd.testing.assert_frame_equal(sample_stock_data, original)
+
+    def test_recomputing_does_not_modify_input(self, sample_stock_data):
+        """Test that overwriting existing MA/EMA columns leaves the input's columns alone."""
+        df = calculate_ma_ema(sample_stock_data, ma_periods=[5], ema_periods=[5])
+        original = df.copy()
+        calculate_ma_ema(df, ma_periods=[5], ema_periods=[5])
+        pd.testing.assert_frame_equal(df, original)
+
+    def test_sorted_input_is_not_deep_copied(self, sample_stock_data):
+        """Test that sorted input keeps its non-float columns shared with the result."""
+        result = calculate_ma_ema(sample_stock_data, ma_periods=[5], ema_periods=[5])
+
+        assert np.shares_memory(result["date"].to_numpy(), sample_stock_data["date"].to_numpy())
+        assert np.shares_memory(result["volume"].to_numpy(), sample_stock_data["volume"].to_numpy())
+
+    def test_assume_sorted_skips_sort(self, sample_stock_data):
+        """Test that assume_sorted matches the default on sorted input and keeps the given row order."""
+        expected = calculate_ma_ema(sample_stock_data, ma_periods=[5], ema_periods=[5])
+        result = calculate_ma_ema(sample_stock_data, ma_periods=[5], ema_periods=[5], assume_sorted=True)
+        pd.testing.assert_frame_equal(result, expected)
+
+        reversed_df = sample_stock_data.iloc[::-1]
+        result = calculate_ma_ema(reversed_df, ma_periods=[5], ema_periods=[5], assume_sorted=True)
+        assert list(result.index) == list(reversed_df.index)
+
+    def test_copy_on_write(self, sample_stock_data):
+        """Test that the read-only close array pandas returns under Copy-on-Write is accepted."""
+        expected = calculate_ma_ema(sample_stock_data, ma_periods=[5, 20], ema_periods=[12])
+        with pd.option_context("mode.copy_on_write", True):
+            result = calculate_ma_ema(sample_stock_data, ma_periods=[5, 20], ema_periods=[12])
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_float32_columns(self, sample_stock_data):
+        """Test that dtype=np.float32 narrows the added columns and stays close to float64."""
+        expected = calculate_ma_ema(sample_stock_data, ma_periods=[5], ema_periods=[12])
+        result = calculate_ma_ema(sample_stock_data, ma_periods=[5], ema_periods=[12], dtype=np.float32)
+
+        assert result["MA5"].dtype == np.float32
+        assert result["EMA12"].dtype == np.float32
+        np.testing.assert_allclose(result["EMA12"], expected["EMA12"], rtol=1e-6)
+
+    def test_unsorted_input(self, sample_stock_data):
+        """Test that rows are put in date order before the averages are computed."""
+        expected = calculate_ma_ema(sample_stock_data, ma_periods=[5], ema_periods=[5])
+        result = calculate_ma_ema(sample_stock_data.iloc[::-1], ma_periods=[5], ema_periods=[5])
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class TestCalculateMAEMABatch:
+    """Test calculate_ma_ema_batch function."""
+
+    def test_matches_single_frame_results(self, sample_stock_data):
+        """Test that each frame gets the same columns as calculate_ma_ema, in input order."""
+        frames = {"600036": sample_stock_data, "601398": sample_stock_data.assign(close=sample_stock_data["close"] * 2)}
+
+        results = calculate_ma_ema_batch(frames, ma_periods=[5, 20], ema_periods=[12], max_workers=2)
+
+        assert list(results) == ["600036", "601398"]
+        for code, df in frames.items():
+            expected = calculate_ma_ema(df, ma_periods=[5, 20], ema_periods=[12])
+            pd.testing.assert_frame_equal(results[code], expected)
+
+    def test_does_not_use_parallel_kernel(self, sample_stock_data, monkeypatch):
+        """Test that worker threads never enter the parallel MA kernel."""
+
+        def fail(*args):
+            raise AssertionError("parallel MA kernel called from a worker thread")
+
+        expected = calculate_ma_ema(sample_stock_data, ma_periods=[5, 20], ema_periods=[12])
+        monkeypatch.setattr(_common, "_ma_kernel", fail)
+
+        results = calculate_ma_ema_batch({"600036": sample_stock_data}, ma_periods=[5, 20], ema_periods=[12])
+
+        pd.testing.assert_frame_equal(results["600036"], expected)
+
+    def test_forwards_options_and_keeps_none(self, sample_stock_data):
+        """Test that dtype and assume_sorted are forwarded and None frames pass through."""
+        results = calculate_ma_ema_batch(
+            {"600036": sample_stock_data, "000000": None},
+            ma_periods=[5],
+            ema_periods=[12],
+            assume_sorted=True,
+            dtype=np.float32,
+        )
+
+        assert results["000000"] is None
+        assert results["600036"]["MA5"].dtype == np.float32
+        assert results["600036"]["EMA12"].dtype == np.float32
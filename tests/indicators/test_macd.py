@@ -1,9 +1,39 @@
 """Tests for MACD indicator functions."""
 
+from unittest.mock import patch
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from poornull.indicators import find_macd_crossovers, tonghuashun_macd
+from poornull.indicators import (
+    calculate_tonghuashun_macd_batch,
+    ema_1d,
+    find_macd_crossovers,
+    tonghuashun_macd,
+    tonghuashun_macd_arrays,
+    tonghuashun_macd_batch,
+)
+
+
+class TestEMA1D:
+    """Test ema_1d function."""
+
+    def test_ema_matches_pandas_ewm(self, sample_stock_data):
+        """Test that ema_1d matches pandas ewm(adjust=False)."""
+        close = sample_stock_data["close"]
+        for span in [5, 12, 26]:
+            expected = close.ewm(span=span, adjust=False).mean().to_numpy()
+            np.testing.assert_allclose(ema_1d(close.to_numpy(), span), expected, atol=1e-10)
+
+    def test_ema_empty(self):
+        """Test that an empty array gives an empty result."""
+        assert ema_1d(np.array([]), span=12).shape == (0,)
+
+    def test_ema_rejects_2d_input(self):
+        """Test that a 2-D array raises an error."""
+        with pytest.raises(ValueError, match="1-D array"):
+            ema_1d(np.ones((2, 3)), span=12)
 
 
 class TestTonghuashunMACD:
@@ -92,6 +122,149 @@ class TestTonghuashunMACD:
                 ratio = default_macd / custom_macd
                 assert abs(ratio - 2.0) < 0.01
 
+    def test_macd_does_not_mutate_input(self, sample_stock_data):
+        """Test that the input DataFrame is left untouched."""
+        original = sample_stock_data.copy()
+
+        tonghuashun_macd(sample_stock_data, close_col="close")
+
+        pd.testing.assert_frame_equal(sample_stock_data, original)
+
+    def test_macd_matches_pandas_ewm(self, sample_stock_data):
+        """Test that MACD values match the pandas ewm(adjust=False) reference."""
+        result = tonghuashun_macd(sample_stock_data, close_col="close")
+
+        close = sample_stock_data["close"]
+        dif = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        dea = dif.ewm(span=9, adjust=False).mean()
+
+        np.testing.assert_allclose(result["DIF"].to_numpy(), dif.to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(result["DEA"].to_numpy(), dea.to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(result["MACD"].to_numpy(), ((dif - dea) * 2.0).to_numpy(), atol=1e-10)
+
+    def test_macd_nan_gap_matches_pandas_ewm(self, sample_stock_data):
+        """Test that a NaN close is skipped like ewm(adjust=False) instead of poisoning later values."""
+        sample_stock_data.loc[50, "close"] = np.nan
+        result = tonghuashun_macd(sample_stock_data, close_col="close")
+
+        close = sample_stock_data["close"]
+        dif = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        dea = dif.ewm(span=9, adjust=False).mean()
+
+        assert not result["DIF"].isna().any()
+        np.testing.assert_allclose(result["DIF"].to_numpy(), dif.to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(result["DEA"].to_numpy(), dea.to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(result["MACD"].to_numpy(), ((dif - dea) * 2.0).to_numpy(), atol=1e-10)
+
+    def test_macd_copy_on_write(self, sample_stock_data):
+        """Test that the read-only arrays pandas hands out under Copy-on-Write are accepted."""
+        expected = tonghuashun_macd(sample_stock_data, close_col="close")
+        with pd.option_context("mode.copy_on_write", True):
+            result = tonghuashun_macd(sample_stock_data, close_col="close")
+            result32 = tonghuashun_macd(sample_stock_data, close_col="close", dtype=np.float32)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result32["DIF"].dtype == np.float32
+
+    def test_macd_float32(self, sample_stock_data):
+        """Test that float32 MACD stays within display precision of the float64 result."""
+        expected = tonghuashun_macd(sample_stock_data, close_col="close")
+        result = tonghuashun_macd(sample_stock_data, close_col="close", dtype=np.float32)
+
+        for col in ["DIF", "DEA", "MACD"]:
+            assert result[col].dtype == np.float32
+            np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), atol=1e-4)
+
+    def test_macd_lfilter_fallback(self, sample_stock_data, monkeypatch):
+        """Test that the lfilter path (no numba) gives the same values as the JIT kernel."""
+        from poornull.indicators import macd
+
+        expected = tonghuashun_macd(sample_stock_data, close_col="close")
+        monkeypatch.setattr(macd, "_macd_kernel", None)
+        result = tonghuashun_macd(sample_stock_data, close_col="close")
+
+        for col in ["DIF", "DEA", "MACD"]:
+            np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), atol=1e-10)
+
+
+class TestTonghuashunMACDArrays:
+    """Test tonghuashun_macd_arrays function."""
+
+    def test_arrays_match_dataframe_api(self, sample_stock_data):
+        """Test that the array variant matches tonghuashun_macd."""
+        expected = tonghuashun_macd(sample_stock_data, close_col="close")
+
+        dif, dea, macd = tonghuashun_macd_arrays(sample_stock_data["close"].to_numpy())
+
+        np.testing.assert_allclose(dif, expected["DIF"].to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(dea, expected["DEA"].to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(macd, expected["MACD"].to_numpy(), atol=1e-10)
+
+    def test_arrays_accept_integer_prices(self):
+        """Test that non-float input is computed as float64."""
+        dif, _, _ = tonghuashun_macd_arrays(np.arange(30))
+        assert dif.dtype == np.float64
+
+    def test_arrays_reject_2d_input(self):
+        """Test that a 2-D array raises an error."""
+        with pytest.raises(ValueError, match="1-D array"):
+            tonghuashun_macd_arrays(np.ones((2, 3)))
+
+
+class TestTonghuashunMACDBatch:
+    """Test tonghuashun_macd_batch function."""
+
+    @pytest.fixture
+    def closes(self):
+        rng = np.random.default_rng(0)
+        return 100 + np.cumsum(rng.standard_normal((4, 120)), axis=1)
+
+    def test_batch_matches_single_series(self, closes):
+        """Test that each row matches tonghuashun_macd on that series."""
+        dif, dea, macd = tonghuashun_macd_batch(closes)
+
+        assert dif.shape == dea.shape == macd.shape == closes.shape
+        dates = pd.date_range("2024-01-01", periods=closes.shape[1], freq="D")
+        for k in range(closes.shape[0]):
+            expected = tonghuashun_macd(pd.DataFrame({"date": dates, "close": closes[k]}))
+            np.testing.assert_allclose(dif[k], expected["DIF"].to_numpy(), atol=1e-10)
+            np.testing.assert_allclose(dea[k], expected["DEA"].to_numpy(), atol=1e-10)
+            np.testing.assert_allclose(macd[k], expected["MACD"].to_numpy(), atol=1e-10)
+
+    def test_batch_lfilter_fallback(self, closes, monkeypatch):
+        """Test that the lfilter path (no numba) matches the parallel kernel."""
+        from poornull.indicators import macd
+
+        expected = tonghuashun_macd_batch(closes)
+        monkeypatch.setattr(macd, "_macd_kernel_2d", None)
+        result = tonghuashun_macd_batch(closes)
+
+        for got, want in zip(result, expected, strict=True):
+            np.testing.assert_allclose(got, want, atol=1e-10)
+
+    def test_batch_nan_gap_matches_single_series(self, closes):
+        """Test that a row with a NaN gap matches the single-series result."""
+        closes[1, 30] = np.nan
+        dif, dea, _ = tonghuashun_macd_batch(closes)
+
+        for k in range(closes.shape[0]):
+            expected_dif, expected_dea, _ = tonghuashun_macd_arrays(closes[k])
+            np.testing.assert_allclose(dif[k], expected_dif, atol=1e-10)
+            np.testing.assert_allclose(dea[k], expected_dea, atol=1e-10)
+
+    def test_batch_read_only_input(self, closes):
+        """Test that a read-only closes matrix is accepted."""
+        expected = tonghuashun_macd_batch(closes)
+        closes.flags.writeable = False
+
+        for got, want in zip(tonghuashun_macd_batch(closes), expected, strict=True):
+            np.testing.assert_array_equal(got, want)
+
+    def test_batch_rejects_1d_input(self):
+        """Test that a 1-D array raises an error."""
+        with pytest.raises(ValueError, match="2-D array"):
+            tonghuashun_macd_batch(np.arange(10.0))
+
 
 class TestFindMACDCrossovers:
     """Test find_macd_crossovers function."""
@@ -143,6 +316,20 @@ class TestFindMACDCrossovers:
         assert "date" in crossovers.columns
         assert "type" in crossovers.columns
 
+    def test_find_crossovers_empty_result_dtypes(self):
+        """Test that an empty result has the same dtypes as a non-empty one."""
+        dates = pd.date_range("2024-01-01", periods=10, freq="D")
+        df = pd.DataFrame({"date": dates, "DIF": [1.0] * 10, "DEA": [0.5] * 10})
+
+        crossovers = find_macd_crossovers(df)
+
+        assert crossovers.empty
+        assert isinstance(crossovers["type"].dtype, pd.CategoricalDtype)
+        assert list(crossovers["type"].cat.categories) == ["golden", "death"]
+        assert crossovers["date"].dtype == df["date"].dtype
+        for col in ["dif", "dea", "macd", "close_price"]:
+            assert crossovers[col].dtype == np.float64
+
     def test_find_crossovers_missing_columns(self):
         """Test that missing DIF or DEA columns raise error."""
         df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=10, freq="D"), "close": range(10)})
@@ -174,3 +361,68 @@ class TestFindMACDCrossovers:
 
         assert len(crossovers) > 0
         assert "golden" in crossovers["type"].values or "death" in crossovers["type"].values
+
+    def test_find_crossovers_positions_and_order(self):
+        """Test that crossovers are reported on the right dates, in date order."""
+        dates = pd.date_range("2024-01-01", periods=10, freq="D")
+        dif_values = [-1.0, -0.5, 0.0, 0.5, 0.5, 0.5, -0.5, -0.5, 0.5, 0.5]
+        df = pd.DataFrame({"date": dates, "close": range(10), "DIF": dif_values, "DEA": [0.0] * 10})
+
+        crossovers = find_macd_crossovers(df)
+
+        assert list(crossovers["type"]) == ["golden", "death", "golden"]
+        assert isinstance(crossovers["type"].dtype, pd.CategoricalDtype)
+        assert list(crossovers["date"]) == [dates[3], dates[6], dates[8]]
+
+    def test_find_crossovers_does_not_mutate_input(self):
+        """Test that no helper columns leak into the caller's DataFrame."""
+        dates = pd.date_range("2024-01-01", periods=10, freq="D")
+        df = pd.DataFrame({"date": dates, "DIF": [-1.0, 1.0] * 5, "DEA": [0.0] * 10})
+        original = df.copy()
+
+        find_macd_crossovers(df)
+
+        pd.testing.assert_frame_equal(df, original)
+
+
+class TestCalculateTonghuashunMACDBatch:
+    """Test calculate_tonghuashun_macd_batch function."""
+
+    @patch("poornull.indicators.macd.calculate_tonghuashun_macd")
+    def test_batch_keeps_input_order(self, mock_calculate):
+        """Test that results are keyed by stock code in input order."""
+        mock_calculate.side_effect = lambda code, start, end: pd.DataFrame({"code": [code]})
+
+        results = calculate_tonghuashun_macd_batch(["600036", "601398", "000001"], "20240101", "20241231")
+
+        assert list(results) == ["600036", "601398", "000001"]
+        assert results["601398"]["code"].iloc[0] == "601398"
+        assert mock_calculate.call_count == 3
+
+    @patch("poornull.indicators.macd.calculate_tonghuashun_macd")
+    def test_batch_failed_stock_is_none(self, mock_calculate):
+        """Test that a failing stock maps to None without aborting the batch."""
+
+        def fake_calculate(code, start, end):
+            if code == "000000":
+                raise ValueError(f"No data found for stock {code}")
+            return pd.DataFrame({"code": [code]})
+
+        mock_calculate.side_effect = fake_calculate
+
+        results = calculate_tonghuashun_macd_batch(["600036", "000000"], "20240101", "20241231")
+
+        assert results["000000"] is None
+        assert results["600036"] is not None
+
+
+class TestCalculateTonghuashunMACD:
+    """Test calculate_tonghuashun_macd function."""
+
+    def test_without_akshare_raises_import_error(self, monkeypatch):
+        """Test that a missing akshare install raises a clear ImportError."""
+        from poornull.indicators import macd
+
+        monkeypatch.setattr(macd, "ak", None)
+        with pytest.raises(ImportError, match="akshare is required"):
+            macd.calculate_tonghuashun_macd("600036", "20240101", "20241231")
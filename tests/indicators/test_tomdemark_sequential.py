@@ -7,6 +7,7 @@ import pytest
 from poornull.indicators import (
     TomDemarkSequentialPhase,
     calculate_tomdemark_sequential,
+    tomdemark_sequential,
 )
 
 
@@ -360,3 +361,32 @@ class TestTomDemarkSequential:
         # All countdown counts should be 0-13
         assert result["TD_Countdown_Count"].min() >= 0
         assert result["TD_Countdown_Count"].max() <= 13
+
+    def test_tomdemark_sequential_python_fallback(self, monkeypatch):
+        """Test that results are the same without the numba kernel."""
+        rng = np.random.default_rng(0)
+        prices = 100 + np.cumsum(rng.normal(0, 1, 500))
+        df = pd.DataFrame(
+            {
+                "date": pd.date_range("2024-01-01", periods=500, freq="D"),
+                "open": prices,
+                "high": prices + rng.uniform(0, 2, 500),
+                "low": prices - rng.uniform(0, 2, 500),
+                "close": prices,
+            }
+        )
+
+        expected = calculate_tomdemark_sequential(df)
+        monkeypatch.setattr(tomdemark_sequential, "_td_sequential_kernel", None)
+        result = calculate_tomdemark_sequential(df)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert (expected["TD_Countdown_Count"] == 13).any()
+
+    def test_tomdemark_sequential_copy_on_write(self, sample_stock_data):
+        """Test that the read-only price arrays pandas returns under Copy-on-Write are accepted."""
+        expected = calculate_tomdemark_sequential(sample_stock_data)
+        with pd.option_context("mode.copy_on_write", True):
+            result = calculate_tomdemark_sequential(sample_stock_data)
+
+        pd.testing.assert_frame_equal(result, expected)
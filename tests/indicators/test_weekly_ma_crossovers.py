@@ -0,0 +1,144 @@
+"""Tests for weekly MA crossover indicator."""
+
+import pandas as pd
+import pytest
+
+from poornull.indicators import find_ma_above_ma60, find_ma_crossovers, weekly_ma_crossovers
+
+
+@pytest.fixture
+def ma_df():
+    """Create MA columns with one MA20 golden/death pair and one MA30 golden cross."""
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-05", periods=6, freq="W-FRI"),
+            "MA20": [9.0, 11.0, 12.0, 9.0, 9.0, 9.0],
+            "MA30": [9.0, 9.0, 9.0, 9.0, 11.0, 11.0],
+            "MA60": [10.0, 10.0, 10.0, 10.0, 10.0, 10.0],
+            "close": [9.5, 10.5, 11.5, 9.5, 10.0, 10.2],
+        }
+    )
+
+
+class TestFindMACrossovers:
+    """Test find_ma_crossovers function."""
+
+    def test_crossover_types_and_dates(self, ma_df):
+        """Test that each crossover is reported once on the bar it happens."""
+        result = find_ma_crossovers(ma_df)
+
+        assert list(result["type"]) == ["golden_ma20", "death_ma20", "golden_ma30"]
+        assert list(result["date"]) == list(ma_df["date"].iloc[[1, 3, 4]])
+
+    def test_type_is_categorical(self, ma_df):
+        """Test that the type column is categorical over all four crossover types."""
+        result = find_ma_crossovers(ma_df)
+
+        assert isinstance(result["type"].dtype, pd.CategoricalDtype)
+        assert list(result["type"].cat.categories) == ["golden_ma20", "death_ma20", "golden_ma30", "death_ma30"]
+
+    def test_is_golden_and_ma_short(self, ma_df):
+        """Test that the parsed crossover direction and MA columns match the type."""
+        result = find_ma_crossovers(ma_df)
+
+        assert list(result["is_golden"]) == [True, False, True]
+        assert list(result["ma_short"]) == ["MA20", "MA20", "MA30"]
+
+    def test_crossover_values(self, ma_df):
+        """Test that MA values and close price are taken from the crossover bar."""
+        result = find_ma_crossovers(ma_df)
+        golden = result.iloc[0]
+
+        assert golden["ma20"] == 11.0
+        assert golden["ma30"] == 9.0
+        assert golden["ma60"] == 10.0
+        assert golden["close_price"] == 10.5
+
+    def test_first_bar_never_crosses(self, ma_df):
+        """Test that the first bar has no previous value to cross from."""
+        ma_df.loc[0, "MA20"] = 11.0
+        result = find_ma_crossovers(ma_df.iloc[:1])
+        assert result.empty
+
+    def test_unsorted_input(self, ma_df):
+        """Test that crossovers are detected in date order for unsorted input."""
+        result = find_ma_crossovers(ma_df.iloc[::-1])
+        assert list(result["type"]) == ["golden_ma20", "death_ma20", "golden_ma30"]
+
+    def test_same_day_crossovers_keep_type_order(self, ma_df):
+        """Test that MA20 and MA30 crossing on the same bar are listed MA20 first."""
+        ma_df["MA30"] = ma_df["MA20"]
+        result = find_ma_crossovers(ma_df)
+        assert list(result["type"]) == ["golden_ma20", "golden_ma30", "death_ma20", "death_ma30"]
+
+    def test_numpy_fallback(self, ma_df, monkeypatch):
+        """Test that results are the same without the numba kernel."""
+        expected = find_ma_crossovers(ma_df)
+        monkeypatch.setattr(weekly_ma_crossovers, "_ma_crossover_kernel", None)
+        pd.testing.assert_frame_equal(find_ma_crossovers(ma_df), expected)
+
+    def test_copy_on_write(self, ma_df):
+        """Test that the read-only MA arrays pandas returns under Copy-on-Write are accepted."""
+        expected = find_ma_crossovers(ma_df)
+        with pd.option_context("mode.copy_on_write", True):
+            result = find_ma_crossovers(ma_df)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_no_crossovers(self, ma_df):
+        """Test that an empty frame with the expected columns is returned."""
+        ma_df["MA20"] = 9.0
+        ma_df["MA30"] = 9.0
+        result = find_ma_crossovers(ma_df)
+
+        assert result.empty
+        assert list(result.columns) == [
+            "date",
+            "type",
+            "is_golden",
+            "ma_short",
+            "ma20",
+            "ma30",
+            "ma60",
+            "close_price",
+        ]
+
+    def test_no_crossovers_dtypes(self, ma_df):
+        """Test that an empty result has the same dtypes as a non-empty one."""
+        ma_df["MA20"] = 9.0
+        ma_df["MA30"] = 9.0
+        result = find_ma_crossovers(ma_df)
+
+        assert list(result["type"].cat.categories) == ["golden_ma20", "death_ma20", "golden_ma30", "death_ma30"]
+        assert list(result["ma_short"].cat.categories) == ["MA20", "MA30"]
+        assert result["is_golden"].dtype == bool
+        assert result["date"].dtype == ma_df["date"].dtype
+        assert result["ma60"].dtype == "float64"
+
+    def test_without_close_column(self, ma_df):
+        """Test that close_price is empty when there is no close column."""
+        result = find_ma_crossovers(ma_df.drop(columns=["close"]))
+        assert result["close_price"].isna().all()
+
+    def test_does_not_modify_input(self, ma_df):
+        """Test that the input DataFrame is not modified."""
+        original = ma_df.copy()
+        find_ma_crossovers(ma_df)
+        pd.testing.assert_frame_equal(ma_df, original)
+
+    def test_missing_column_raises_error(self, ma_df):
+        """Test that a missing MA column raises ValueError."""
+        with pytest.raises(ValueError, match="MA60 column 'MA60' not found"):
+            find_ma_crossovers(ma_df.drop(columns=["MA60"]))
+
+
+class TestFindMAAboveMA60:
+    """Test find_ma_above_ma60 function."""
+
+    def test_rows_above_ma60(self, ma_df):
+        """Test that only rows with MA20 or MA30 above MA60 are returned."""
+        result = find_ma_above_ma60(ma_df)
+
+        assert list(result["date"]) == list(ma_df["date"].iloc[[1, 2, 4, 5]])
+        assert list(result["ma20_above"]) == [True, True, False, False]
+        assert list(result["ma30_above"]) == [False, False, True, True]